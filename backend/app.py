@@ -1,4 +1,7 @@
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 
 from flask import Flask
 from flask_cors import CORS
@@ -13,15 +16,25 @@ from src.novels import api as novels_api
 from src.novels import novels_module
 from src.seeds.genres import seed_genres
 from src.seeds.moods import seed_moods
+from src.services.json_provider import ORJSONProvider, output_json
 from src.tests import api as test_api
 from src.tests import test_module
 from src.users import api as user_api
 from src.users import users_module
 
 # Configure logging
-logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+# 出力はバックグラウンドのスレッドが行い、生成処理やリクエスト処理のスレッドをログの書き込みで待たせない
+_log_handler = logging.StreamHandler()
+_log_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+_log_queue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, _log_handler)
+# キューに積むのはメッセージ本文のみ（日時などの書式はリスナー側のハンドラで付与する）
+logging.basicConfig(level=logging.INFO, format="%(message)s", handlers=[QueueHandler(_log_queue)])
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # データベースの初期化
 init_db(app)
@@ -31,6 +44,7 @@ seed_moods(app)
 
 # flask-restxの設定
 api = Api(app, version="1.0", title="ReadFit API", description="時間ぴったり読書アプリAPI")
+api.representation("application/json")(output_json)
 
 # /tests以下のエンドポイントを登録
 app.register_blueprint(test_module)
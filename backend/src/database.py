@@ -4,11 +4,17 @@
 SQLAlchemyのインスタンスと設定を管理します。
 """
 
+import os
+
 from flask_sqlalchemy import SQLAlchemy
 
 # SQLAlchemyインスタンスの作成
 db = SQLAlchemy()
 
+# 以前作成していたが使われなくなったインデックス（既存のデータベースから削除する）
+# ix_chapters_novel_id_active: どの問い合わせでも使われず、章の登録・更新のたびに更新されるだけだった
+_OBSOLETE_INDEXES = ("ix_chapters_novel_id_active",)
+
 
 def init_db(app):
     """
@@ -21,6 +27,14 @@ def init_db(app):
     app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///readfit.db"
     # track modificationsの無効化（パフォーマンス向上のため）
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # コネクションプールの設定
+    # バックグラウンドの生成タスクとリクエスト処理が同時に接続を使うため、既定値(5 + 10)より大きくする
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+    }
 
     # アプリケーションにデータベースを初期化
     db.init_app(app)
@@ -28,3 +42,10 @@ def init_db(app):
     # アプリケーションコンテキスト内でテーブルを作成
     with app.app_context():
         db.create_all()
+        # create_all()は既存テーブルにインデックスを追加しないため、不足しているインデックスを作成する
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(db.engine, checkfirst=True)
+        with db.engine.begin() as conn:
+            for name in _OBSOLETE_INDEXES:
+                conn.execute(db.text(f"DROP INDEX IF EXISTS {name}"))
@@ -55,6 +55,10 @@ class Novel(db.Model):
     """
 
     __tablename__ = "novels"
+    __table_args__ = (
+        # ユーザーごとの小説一覧（/users/<user_id>/novels）の絞り込みに使用
+        db.Index("ix_novels_user_id", "user_id"),
+    )
 
     id = db.Column(db.String(32), primary_key=True, default=lambda: uuid4().hex)
     title = db.Column(db.String(200), nullable=False)  # AIが生成した小説のタイトル
@@ -79,7 +83,10 @@ class Novel(db.Model):
     is_favorite = db.Column(db.Boolean, nullable=False, default=False)
 
     # リレーション: 小説は複数のチャプターを持つ
-    chapters = db.relationship("Chapter", backref="novel", lazy=True, cascade="all, delete-orphan")
+    # 章番号順に読み込む（インデックス ix_chapters_novel_id_chapter_number_status を利用）
+    chapters = db.relationship(
+        "Chapter", backref="novel", lazy=True, cascade="all, delete-orphan", order_by="Chapter.chapter_number"
+    )
 
     def __repr__(self):
         return f"<Novel {self.title}>"
@@ -93,6 +100,10 @@ class Chapter(db.Model):
     """
 
     __tablename__ = "chapters"
+    __table_args__ = (
+        # 小説ごとの章の取得・章番号順の並び替え・ステータスによる絞り込みに使用
+        db.Index("ix_chapters_novel_id_chapter_number_status", "novel_id", "chapter_number", "status"),
+    )
 
     id = db.Column(db.String(32), primary_key=True, default=lambda: uuid4().hex)
     chapter_number = db.Column(db.Integer, nullable=False)
@@ -1,14 +1,27 @@
-import json
+import atexit
+import hashlib
 import logging
-import threading
+import os
+from concurrent.futures import ThreadPoolExecutor
+from uuid import uuid4
 
+import orjson
 from dotenv import load_dotenv
 from flask import Blueprint, Response, request, stream_with_context
 from flask_restx import Namespace, Resource, fields, reqparse
+from werkzeug.exceptions import HTTPException
+from werkzeug.http import quote_etag
 
 from src.database import db
-from src.models import Chapter, Genre, Mood, Novel, NovelStatus, User
-from src.services.error_handler import handle_chapter_generation_failure, mark_novel_as_failed
+from src.models import Chapter, Novel, NovelStatus, User
+from src.services.error_handler import handle_chapter_generation_failure, invalidate_failed_cache, mark_novel_as_failed
+from src.services.novel_cache import (
+    clear_novel_progress,
+    get_genre_names,
+    get_mood_names,
+    get_novel_progress,
+    update_novel_progress,
+)
 from src.services.novel_generator import NovelGenerator  # ここでこれを使わないほうが綺麗だが必須ではない.
 from src.services.novelist import Novelist
 
@@ -22,105 +35,205 @@ novels_module = Blueprint("novel_module", __name__)
 api = Namespace("novels", description="小説生成・管理用エンドポイント群")
 
 
-# リストからcompare_funcがTrueを返す要素のインデックスを得る.
-def list_finder(tar_list, compare_func):
-    for i in range(len(tar_list)):
-        if compare_func(tar_list[i]):
-            return i
-    return -1
+def check_etag(*parts):
+    """ETagを計算し、リクエストのIf-None-Matchと一致する場合は304を返す
+
+    レスポンス本体を組み立てる前に、軽量な集計値から呼び出します。
+
+    Args:
+        *parts: ETagの元になる値（レスポンス内容が変わると変化する値）
+
+    Returns:
+        dict: レスポンスに付与するETagヘッダー
+
+    Raises:
+        HTTPException: If-None-MatchがETagと一致する場合（304 Not Modified）
+    """
+    etag = hashlib.md5(":".join(str(part) for part in parts).encode()).hexdigest()
+    headers = {"ETag": quote_etag(etag)}
+    if request.if_none_match.contains(etag):
+        raise HTTPException(response=Response(status=304, headers=headers))
+    return headers
+
+
+# NovelStreamで生成した章をまとめてコミットする章数
+STREAM_COMMIT_BATCH_SIZE = 5
 
 
 # -- threading --
+# バックグラウンドタスク用のスレッドプール（同時に生成する小説数とDBセッション数の上限）
+bg_task_pool = ThreadPoolExecutor(max_workers=int(os.getenv("NOVEL_BG_WORKERS", "4")), thread_name_prefix="novelist-bg")
+atexit.register(bg_task_pool.shutdown, wait=False)
+
+
+# バックグラウンドタスクで使用するFlaskアプリケーション（循環importを避けるため初回使用時に取得）
+_app = None
+
+
+def _get_app():
+    """バックグラウンドタスク用のFlaskアプリケーションを取得する
+
+    Returns:
+        Flask: Flaskアプリケーションインスタンス
+    """
+    global _app
+    if _app is None:
+        from app import app
+
+        _app = app
+    return _app
+
+
+def _log_bg_task_exception(future):
+    """バックグラウンドタスクの未処理例外をログに記録する
+
+    Args:
+        future: 完了したタスクのFuture
+    """
+    if future.cancelled():
+        logger.warning("Background task was cancelled")
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Background task: Unhandled error - {type(error).__name__}: {error}")
+
+
+def submit_bg_task(*args):
+    """小説生成のバックグラウンドタスクをスレッドプールに投入する
+
+    Args:
+        *args: novelist_bg_task_runnerに渡す引数
+
+    Returns:
+        Future: 投入したタスクのFuture
+    """
+    future = bg_task_pool.submit(novelist_bg_task_runner, *args)
+    future.add_done_callback(_log_bg_task_exception)
+    return future
+
+
 # バックエンドタスク.
-def novelist_bg_task_runner(novelist, novel_id, start_from_chapter=None):
+def novelist_bg_task_runner(novel_id, chapter_ids, start_from_chapter):
     """バックグラウンドで小説の章を順次生成するタスク
 
     指定された章から順番に生成し、データベースに保存します。
     エラーが発生した場合は生成を停止し、適切にステータスを更新します。
 
     Args:
-        novelist: Novelistインスタンス
         novel_id: 小説のID
-        start_from_chapter: 生成を開始する章番号（Noneの場合はnovelist.next_chapter_numから開始）
+        chapter_ids: 章番号をキー、章IDを値とする辞書（呼び出し側で登録済みの章）
+        start_from_chapter: 生成を開始する章番号
 
     Note:
-        start_from_chapterを指定した場合、novelist.next_chapter_numを上書きします。
-        これにより、リトライ時に特定の章から生成を再開できます。
+        Novelistは保存済みのinit_dataからタスク内で再構築し、開始章の前章の本文はDBから読み込みます。
+        呼び出し側はNovelistを保持し続ける必要がなく、タスクの引数はIDと章番号のみです。
+        章の状態は章IDを指定したUPDATE文で直接更新するため、章一覧のSELECTは行いません。
+        章の生成開始は別の短いトランザクションで即時反映し、生成中にセッションのトランザクションを保持しません。
+        セッションのコミットは1章につき1回です。
     """
-    logger.info("Background task started")
-    from app import app
+    logger.info(f"Background task started - Novel ID: {novel_id}, Chapter: {start_from_chapter}")
 
-    if not isinstance(novelist, Novelist):
-        return
-
-    with app.app_context():
-        # 開始章が指定されている場合は、novelistの内部状態を更新
-        if start_from_chapter is not None:
-            novelist.next_chapter_num = start_from_chapter
-            logger.info(f"Background task: Resuming from chapter {start_from_chapter}")
+    with _get_app().app_context():
+        novelist = None
         try:
-            chapters_data = db.session.query(Chapter).filter_by(novel_id=novel_id).all()
-
             # 小説のステータスをGENERATINGに更新
             novel_data = db.session.get(Novel, novel_id)
             if not novel_data:
                 logger.error(f"Background task: Novel not found, task terminated - ID: {novel_id}")
                 return
 
+            # 保存済みのinit_dataからNovelistを再構築
+            novelist = Novelist()
+            novelist.load_from_init_data(novel_data.init_data)
+            novelist.target_text_length = novel_data.text_length
+            novelist.other_settings = {"style": novel_data.style, "genre": novel_data.genre_code}
+            novelist.next_chapter_num = start_from_chapter
+            if start_from_chapter > 1:
+                novelist.previous_chapter_content = (
+                    db.session.execute(
+                        db.select(Chapter.content).where(
+                            Chapter.novel_id == novel_id, Chapter.chapter_number == start_from_chapter - 1
+                        )
+                    ).scalar()
+                    or ""
+                )
+            user_id = novel_data.user_id
+
             novel_data.status = NovelStatus.GENERATING
             db.session.commit()
+            update_novel_progress(
+                novel_id,
+                user_id=user_id,
+                novel_status=NovelStatus.GENERATING,
+                current_chapter=None,
+                last_completed_chapter=novelist.next_chapter_num - 1,
+                total_chapter_number=novelist.chapter_count,
+            )
+
+            # 残りが2章以上ある場合は、各章のプロンプトでプロットを再送しないようコンテキストキャッシュを使う
+            if novelist.chapter_count - novelist.next_chapter_num >= 1:
+                novelist.create_plot_cache()
 
             # 章を順次生成
             while not novelist.is_completed():
-                # 対象chapterの探索
-                chpind = list_finder(chapters_data, lambda x: x.chapter_number == novelist.next_chapter_num)
-                chapter = None
-
-                if chpind == -1:
-                    # チャプターがDBに存在しない場合は作成（通常は発生しないはず）
-                    logger.warning(
-                        f"Background task: Chapter data not found in DB, creating new - Chapter: {novelist.next_chapter_num}"
-                    )
-                    new_chapter = Chapter(
-                        chapter_number=novelist.next_chapter_num,
-                        content="NO CONTENT",
-                        novel_id=novel_id,
-                        status=NovelStatus.GENERATING,
-                        plot=novelist.chapter_plots[novelist.next_chapter_num - 1],
-                    )
-                    db.session.add(new_chapter)
-                    chapter = new_chapter
-                else:
-                    chapter = chapters_data[chpind]
-
-                # チャプターのステータスをGENERATINGに更新
-                chapter.status = NovelStatus.GENERATING
-                db.session.commit()
+                chapter_num = novelist.next_chapter_num
+                chapter_id = chapter_ids.get(chapter_num)
+
+                # 生成開始はポーリング側から見えるよう、セッションとは別の短いトランザクションで反映する
+                with db.engine.begin() as conn:
+                    if chapter_id is None:
+                        # チャプターがDBに存在しない場合は作成（通常は発生しないはず）
+                        logger.warning(
+                            f"Background task: Chapter data not found in DB, creating new - Chapter: {chapter_num}"
+                        )
+                        chapter_id = uuid4().hex
+                        conn.execute(
+                            db.insert(Chapter).values(
+                                id=chapter_id,
+                                chapter_number=chapter_num,
+                                content="NO CONTENT",
+                                novel_id=novel_id,
+                                status=NovelStatus.GENERATING,
+                                plot=novelist.chapter_plots[chapter_num - 1].get("plot"),
+                            )
+                        )
+                        chapter_ids[chapter_num] = chapter_id
+                    else:
+                        # チャプターのステータスをGENERATINGに更新
+                        conn.execute(
+                            db.update(Chapter).where(Chapter.id == chapter_id).values(status=NovelStatus.GENERATING)
+                        )
+                update_novel_progress(novel_id, current_chapter=chapter_num)
 
                 # 章を生成（エラーは上位でキャッチ）
                 try:
-                    logger.info(f"Background task: Starting chapter generation - Chapter: {novelist.next_chapter_num}")
+                    logger.info(f"Background task: Starting chapter generation - Chapter: {chapter_num}")
                     chapter_content = novelist.write_next_chapter()
-                    chapter.content = chapter_content
-                    content_length = len(chapter_content)
-                    chapter.status = NovelStatus.COMPLETED
-                    novel_data.true_text_length += content_length
-                    db.session.commit()
-                    logger.info(
-                        f"Background task: Chapter generated and committed - Chapter: {novelist.next_chapter_num - 1}"
+                    db.session.execute(
+                        db.update(Chapter)
+                        .where(Chapter.id == chapter_id)
+                        .values(content=chapter_content, status=NovelStatus.COMPLETED)
+                    )
+                    db.session.execute(
+                        db.update(Novel)
+                        .where(Novel.id == novel_id)
+                        .values(true_text_length=Novel.true_text_length + len(chapter_content))
                     )
+                    db.session.commit()
+                    update_novel_progress(novel_id, current_chapter=None, last_completed_chapter=chapter_num)
+                    logger.info(f"Background task: Chapter generated and committed - Chapter: {chapter_num}")
 
                 except Exception as e:
                     # 章の生成が完全に失敗した場合
                     logger.error(f"Background task: Chapter generation failed - {type(e).__name__}: {e}")
                     handle_chapter_generation_failure(
-                        novel_id=novel_id, chapter_id=chapter.id, error=e, db_session=db.session
+                        novel_id=novel_id, chapter_id=chapter_id, error=e, db_session=db.session
                     )
                     logger.info("Background task: Task stopped due to chapter generation failure")
                     return  # 生成を停止
 
             # 全章完了
-            novel_data.status = NovelStatus.COMPLETED
+            db.session.execute(db.update(Novel).where(Novel.id == novel_id).values(status=NovelStatus.COMPLETED))
             db.session.commit()
             logger.info(f"Background task: Novel completed and committed - Novel ID: {novel_id}")
 
@@ -140,6 +253,12 @@ def novelist_bg_task_runner(novelist, novel_id, start_from_chapter=None):
                 logger.error(f"Background task: Failed to mark novel as failed - {mark_error}")
             logger.error("Background task: Task terminated due to critical error")
 
+        finally:
+            if novelist is not None:
+                novelist.delete_plot_cache()
+            # 完了・失敗後の問い合わせはDBから応答する
+            clear_novel_progress(novel_id)
+
 
 # --- model ---
 novel_start_model = api.model(
@@ -186,6 +305,57 @@ novel_item_model = api.model(
         "updated_at": fields.DateTime(),
     },
 )
+
+
+def select_novel_list_items(*criteria) -> list:
+    """小説一覧のレスポンスを取得する
+
+    novel_item_modelで返す列のみをSELECTし、ORMのインスタンス化やmarshalを経由せずに
+    レスポンス用の辞書を直接組み立てます（overall_plotやinit_dataなどの長いテキストは読み込まない）。
+
+    Args:
+        *criteria: 一覧の絞り込み条件
+
+    Returns:
+        list: novel_item_modelと同じ形式の辞書のリスト
+    """
+    rows = db.session.execute(
+        db.select(
+            Novel.id,
+            Novel.title,
+            Novel.short_summary,
+            Novel.genre_code,
+            Novel.mood_code,
+            Novel.style,
+            Novel.text_length,
+            Novel.true_text_length,
+            Novel.is_favorite,
+            Novel.user_id,
+            Novel.status,
+            Novel.created_at,
+            Novel.updated_at,
+        ).where(*criteria)
+    )
+    return [
+        {
+            "novel_id": row.id,
+            "title": row.title,
+            "short_summary": row.short_summary,
+            "genre": row.genre_code,
+            "mood": row.mood_code,
+            "style": row.style,
+            "text_length": row.text_length,
+            "true_text_length": row.true_text_length,
+            "is_favorite": row.is_favorite,
+            "user_id": row.user_id,
+            "novel_status": int(row.status),
+            "created_at": row.created_at,
+            "updated_at": row.updated_at,
+        }
+        for row in rows
+    ]
+
+
 novel_content_model = api.model(
     "NovelContent",
     {
@@ -245,15 +415,17 @@ novels_contents_parser.add_argument(
 @api.route("/")
 class NovelList(Resource):
     @api.doc("get_all_novels_for_test")
-    @api.marshal_list_with(novel_item_model)
+    @api.response(200, "小説の一覧", [novel_item_model])
     def get(self):
         """登録されている小説一覧を返す
 
         Returns:
             list: 登録されている小説の一覧
         """
-        novels = db.session.query(Novel).all()
-        return novels
+        headers = check_etag(
+            *db.session.execute(db.select(db.func.count(Novel.id), db.func.max(Novel.updated_at))).one()
+        )
+        return select_novel_list_items(), 200, headers
 
 
 # "/novels/streams" : 小説生成の開始時のエンドポイント.
@@ -275,32 +447,31 @@ class NovelStream(Resource):
         """
         try:
             # リクエストボディの解凍.
-            requested_param = request.get_json()
+            requested_param = request.get_json(cache=False)
             user_id = requested_param.get("user_id")
             genre = requested_param.get("genre")
             text_length = requested_param.get("textLen")
             style = requested_param.get("style")
 
-            # データベースからuser_idに対応するデータを取得
-            user_data = db.session.query(User).filter_by(id=user_id).first()
-            if not user_data:
+            # ユーザーの存在のみを確認（行全体は読み込まない）
+            if db.session.scalar(db.select(User.id).where(User.id == user_id)) is None:
                 return {"error": f"User {user_id} not found"}, 404
 
-            # データベースに新たな小説データを登録
-            novel_data = Novel(
-                style=style,
-                genre_code=genre,
-                text_length=text_length,
-                title="test",  # TODO: タイトル生成機能実装時に更新
-                overall_plot="",  # TODO: プロット生成後に更新
-                user_id=user_data.id,
+            # 小説IDを先に決めておき、登録後に小説を読み直さずジェネレータ内で使用する
+            novel_id = uuid4().hex
+            db.session.execute(
+                db.insert(Novel).values(
+                    id=novel_id,
+                    style=style,
+                    genre_code=genre,
+                    text_length=text_length,
+                    title="test",  # タイトル生成後に更新
+                    overall_plot="",  # プロット生成後に更新
+                    user_id=user_id,
+                )
             )
-            db.session.add(novel_data)
             db.session.commit()
 
-            # 小説IDを保存（ジェネレータ内でも安全に使用可能）
-            novel_id = novel_data.id
-
             # ai-apiとのやり取り
             novelist = NovelGenerator()
             novelist.setup_ai()
@@ -309,41 +480,81 @@ class NovelStream(Resource):
             # - DB登録
             # - レスポンスのjsonボディに変形
             def novel_generater():
+                # 生成済みの章はSTREAM_COMMIT_BATCH_SIZE章ごとにまとめ、書き込み用スレッドで登録・コミットする
+                # （クライアントへの送信をDB書き込みの完了待ちで止めないため）
+                pending_chapters = []
+                pending_writes = []
+                engine = db.engine
+                writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="novel-stream-writer")
+
+                def persist_chapters(rows):
+                    with engine.begin() as conn:
+                        conn.execute(db.insert(Chapter), rows)
+
+                def commit_pending_chapters():
+                    if pending_chapters:
+                        pending_writes.append(writer.submit(persist_chapters, list(pending_chapters)))
+                        pending_chapters.clear()
+
                 try:
                     gen = novelist.generate_novel(genre, text_length, style)
                     count, plot = next(gen)
 
-                    # プロットの保存
-                    novel = db.session.get(Novel, novel_id)
-                    novel.overall_plot = plot
+                    # プロットとタイトルの保存（小説を読み込まずにUPDATE文で直接更新）
+                    values = {"overall_plot": plot}
+                    if novelist.title:
+                        values["title"] = novelist.title
+                    db.session.execute(db.update(Novel).where(Novel.id == novel_id).values(**values))
                     db.session.commit()
                     logger.info(f"Plot generated - Novel ID: {novel_id}, Count: {count}")
-                    yield json.dumps({"response_count": count, "plot": plot}, ensure_ascii=False) + "\n"
+                    yield orjson.dumps({"response_count": count, "title": novelist.title, "plot": plot}) + b"\n"
 
-                    for count, chapter in gen:
+                    # 章の断片は届いた順にそのまま送信し、章の終わりで本文を結合して登録する
+                    chapter_count = 0
+                    chapter_pieces = []
+
+                    def finish_chapter(chapter_number):
+                        chapter = "".join(chapter_pieces)
+                        chapter_pieces.clear()
                         logger.info(
-                            f"Chapter generated - Novel ID: {novel_id}, Chapter: {count}, Length: {len(chapter)}"
+                            "Chapter generated - Novel ID: %s, Chapter: %d, Length: %d",
+                            novel_id,
+                            chapter_number,
+                            len(chapter),
                         )
-                        chapter_data = Chapter(chapter_number=count, content=chapter, novel_id=novel_id)
-                        db.session.add(chapter_data)
-                        logger.debug(f"Chapter added to session - Chapter: {count}")
-                        yield json.dumps({"response_count": count, "chapter": chapter}, ensure_ascii=False) + "\n"
-
-                    db.session.commit()
+                        pending_chapters.append(
+                            {"chapter_number": chapter_number, "content": chapter, "novel_id": novel_id}
+                        )
+                        if len(pending_chapters) >= STREAM_COMMIT_BATCH_SIZE:
+                            commit_pending_chapters()
+                            logger.debug(f"Chapters submitted for commit - Up to chapter: {chapter_number}")
+
+                    for count, piece in gen:
+                        if count != chapter_count:
+                            if chapter_pieces:
+                                finish_chapter(chapter_count)
+                            chapter_count = count
+                        chapter_pieces.append(piece)
+                        yield orjson.dumps({"response_count": count, "chapter_delta": piece}) + b"\n"
+                    if chapter_pieces:
+                        finish_chapter(chapter_count)
+
+                    commit_pending_chapters()
+                    # 全ての書き込みの完了を待ち、失敗があればここで例外を送出する
+                    for future in pending_writes:
+                        future.result()
                     logger.info(f"All chapters committed to database - Novel ID: {novel_id}")
-                    yield json.dumps({"response_count": count + 1, "fin": True}, ensure_ascii=False) + "\n"
+                    yield orjson.dumps({"response_count": count + 1, "fin": True}) + b"\n"
                 except Exception as e:
                     logger.error(f"Error in novel_generater - Novel ID: {novel_id}: {str(e)}")
                     import traceback
 
                     traceback.print_exc()
-                    yield json.dumps({"error": str(e)}, ensure_ascii=False) + "\n"
+                    yield orjson.dumps({"error": str(e)}) + b"\n"
+                finally:
+                    writer.shutdown(wait=True)
 
-            return Response(
-                stream_with_context(novel_generater()),
-                mimetype="application/json",
-                headers={"Content-Type": "application/json; charset=utf-8"},
-            )
+            return Response(stream_with_context(novel_generater()), mimetype="application/x-ndjson")
         except Exception as e:
             return {"status": False, "error": str(e)}
 
@@ -361,28 +572,60 @@ class NovelDetail(Resource):
         Returns:
             Dict: 指定された小説の詳細情報
         """
-        novel = db.session.get(Novel, novel_id)
-        if not novel:
+        updated_at = db.session.execute(db.select(Novel.updated_at).where(Novel.id == novel_id)).scalar()
+        if updated_at is None:
             api.abort(404, f"Novel {novel_id} not found")
-        return novel
+        headers = check_etag(novel_id, updated_at)
+        novel = db.session.get(Novel, novel_id)
+        return novel, 200, headers
 
 
 @api.route("/<string:novel_id>/chapters")
 class NovelChapters(Resource):
     @api.doc("get_novel_chapters", params={"novel_id": "小説のID"})
-    @api.marshal_list_with(chapter_item_model)
+    @api.response(200, "章ごとに1行のNDJSON", [chapter_item_model])
     def get(self, novel_id):
         """指定された小説の全チャプター一覧を返す
 
+        全章を一度にメモリへ読み込まず、章ごとに1行のJSON(NDJSON)として逐次送信します。
+
         Args:
             novel_id (str): 小説のID
 
         Returns:
-            list: 指定された小説の全チャプター一覧
+            Response: 指定された小説の全チャプター一覧(application/x-ndjson)
         """
-        # データベースからnovel_idに対応するデータを取得
-        chapters = db.session.query(Chapter).filter_by(novel_id=novel_id).order_by(Chapter.chapter_number).all()
-        return chapters
+        headers = check_etag(
+            novel_id,
+            *db.session.execute(
+                db.select(db.func.count(Chapter.id), db.func.max(Chapter.updated_at)).where(
+                    Chapter.novel_id == novel_id
+                )
+            ).one(),
+        )
+
+        def chapter_lines():
+            # データベースからnovel_idに対応するデータを200件ずつ取得して送信
+            rows = db.session.execute(
+                db.select(Chapter.id, Chapter.content, Chapter.created_at, Chapter.updated_at)
+                .where(Chapter.novel_id == novel_id)
+                .order_by(Chapter.chapter_number)
+                .execution_options(yield_per=200)
+            )
+            for chapter_id, content, created_at, updated_at in rows:
+                yield (
+                    orjson.dumps(
+                        {
+                            "chapter_id": chapter_id,
+                            "content": content,
+                            "created_at": created_at,
+                            "updated_at": updated_at,
+                        }
+                    )
+                    + b"\n"
+                )
+
+        return Response(stream_with_context(chapter_lines()), mimetype="application/x-ndjson", headers=headers)
 
 
 @api.route("/<string:novel_id>/contents")
@@ -414,7 +657,6 @@ class NovelContent(Resource):
                 ]
             }
         """
-        novel = db.session.get(Novel, novel_id)
         user_id = request.headers.get("X-User-ID")
         current_index = request.headers.get("X-Current-Index")
         # 情報なしエラー.
@@ -423,36 +665,81 @@ class NovelContent(Resource):
         if not current_index:
             api.abort(401, "Authorization header 'X-Current-Index' is required")
         current_index = int(current_index)
+
+        # 生成中の小説は進捗キャッシュを参照し、新しい章がなければDBに問い合わせずに返す
+        progress = get_novel_progress(novel_id)
+        if progress and current_index >= progress["last_completed_chapter"]:
+            if progress["user_id"] != user_id:
+                api.abort(403, "You do not have permission to access this novel")
+            headers = check_etag(novel_id, current_index, "progress", progress["version"])
+            return (
+                {
+                    "novel_status": progress["novel_status"].name,
+                    "current_chapter": progress["current_chapter"],
+                    "total_chapter_number": progress["total_chapter_number"],
+                    "new_chapters": [],
+                },
+                200,
+                headers,
+            )
+
+        # 小説の所有者・ステータスと、全章数・現在生成中または失敗した章番号・
+        # 取得済みの章以降で最初の未完成の章番号を1回の問い合わせで求める
+        row = db.session.execute(
+            db.select(
+                Novel.user_id,
+                Novel.status,
+                db.func.count(Chapter.id),
+                db.func.min(
+                    db.case((Chapter.status.in_([NovelStatus.GENERATING, NovelStatus.FAILED]), Chapter.chapter_number))
+                ),
+                db.func.min(
+                    db.case(
+                        (
+                            db.and_(Chapter.chapter_number > current_index, Chapter.status != NovelStatus.COMPLETED),
+                            Chapter.chapter_number,
+                        )
+                    )
+                ),
+                db.func.max(Chapter.updated_at),
+            )
+            .outerjoin(Chapter, Chapter.novel_id == Novel.id)
+            .where(Novel.id == novel_id)
+            .group_by(Novel.id)
+        ).first()
         # 小説なしエラー.
-        if not novel:
+        if row is None:
             api.abort(404, f"Novel not found - id:{novel_id}")
+        owner_id, novel_status, total_chapter_number, current_chapter, next_incomplete_chapter, last_updated = row
         # ユーザーの権限なしエラー.
-        if novel.user_id != user_id:
+        if owner_id != user_id:
             api.abort(403, "You do not have permission to access this novel")
+        # 章の本文を取得する前に、変更がなければ304を返す
+        headers = check_etag(novel_id, current_index, *row[1:])
 
-        chapters = db.session.query(Chapter).filter_by(novel_id=novel_id).order_by(Chapter.chapter_number).all()
-
-        # 現在生成中または失敗した章番号を特定
-        current_chapter = None
-        for chapter in chapters:
-            if chapter.status in [NovelStatus.GENERATING, NovelStatus.FAILED]:
-                current_chapter = chapter.chapter_number
-                break
-
-        # 完成した章のみを順番に返す
+        # 完成した章のみを順番に返す（最初の未完成の章の手前まで）
         results = []
-        for i in range(current_index, len(chapters)):
-            if chapters[i].status == NovelStatus.COMPLETED:
-                results.append({"index": i + 1, "content": chapters[i].content})
-            else:
-                break
-
-        return {
-            "novel_status": novel.status.name,
-            "current_chapter": current_chapter,
-            "total_chapter_number": len(chapters),
-            "new_chapters": results,
-        }
+        if next_incomplete_chapter != current_index + 1:
+            query = db.select(Chapter.chapter_number, Chapter.content).where(
+                Chapter.novel_id == novel_id, Chapter.chapter_number > current_index
+            )
+            if next_incomplete_chapter is not None:
+                query = query.where(Chapter.chapter_number < next_incomplete_chapter)
+            results = [
+                {"index": chapter_number, "content": content}
+                for chapter_number, content in db.session.execute(query.order_by(Chapter.chapter_number))
+            ]
+
+        return (
+            {
+                "novel_status": novel_status.name,
+                "current_chapter": current_chapter,
+                "total_chapter_number": total_chapter_number,
+                "new_chapters": results,
+            },
+            200,
+            headers,
+        )
 
 
 @api.route("/init")
@@ -475,7 +762,7 @@ class NovelInit(Resource):
         """
         try:
             # データ解凍
-            requested_param = request.get_json()
+            requested_param = request.get_json(cache=False)
             user_id = requested_param.get("user_id")
             novel_setting = requested_param.get("novel_setting")
             if not isinstance(novel_setting, dict):
@@ -483,40 +770,31 @@ class NovelInit(Resource):
             text_length = novel_setting.get("ideal_text_length")
             if text_length is None:
                 return {"error": "Missing 'ideal_text_length' in 'novel_setting'."}, 400
-            novel_other_settings = novel_setting.copy()
-            novel_other_settings.pop("ideal_text_length")
+            novel_other_settings = {k: v for k, v in novel_setting.items() if k != "ideal_text_length"}
 
-            # ユーザーの確認
-            user_data = db.session.query(User).filter_by(id=user_id).first()
-            if not user_data:
+            # ユーザーの確認（存在のみを確認し、行全体は読み込まない）
+            if db.session.scalar(db.select(User.id).where(User.id == user_id)) is None:
                 return {"error": f"user not found - user_id: {user_id}"}, 404
 
             # genreのコード確認
+            # (コードと表示名の対応はプロセス内にキャッシュしたものを使う)
             genre_code = novel_other_settings.get("genre")
             if genre_code:
-                genre_exists = db.session.query(db.exists().where(Genre.code == genre_code)).scalar()
-                if not genre_exists:
+                genre_names = get_genre_names()
+                if genre_code not in genre_names:
                     return {"error": f"Invalid genre code: {genre_code}"}, 400
 
                 # AIにGenre.genreを渡すようにnovel_other_settingを修正
-                genre_obj = Genre.query.filter_by(code=genre_code).first()
-                if genre_obj:
-                    novel_other_settings["genre"] = genre_obj.genre
-                else:
-                    return {"error": f"genre not found but exists: {genre_code}"}, 500
+                novel_other_settings["genre"] = genre_names[genre_code]
 
             # moodのコード確認 or noneを代用
             mood_code = novel_other_settings.get("mood", "none")
-            mood_exists = db.session.query(db.exists().where(Mood.code == mood_code)).scalar()
+            mood_names = get_mood_names()
+            if mood_code not in mood_names:
+                return {"error": f"Invalid mood code: {mood_code}"}, 400
 
             # AIにMood.moodを渡すようにnovel_other_settingを修正
-            if not mood_exists:
-                return {"error": f"Invalid mood code: {mood_code}"}, 400
-            mood_obj = Mood.query.filter_by(code=mood_code).first()
-            if mood_obj:
-                novel_other_settings["mood"] = mood_obj.mood
-            else:
-                return {"error": f"mood not found but exists: {mood_code}"}, 500
+            novel_other_settings["mood"] = mood_names[mood_code]
 
             # Novelist準備
             logger.info("starting novelist setup")
@@ -526,40 +804,46 @@ class NovelInit(Resource):
             logger.info("finished novelist setup")
 
             # Novelのデータベース登録
-            novel_data = Novel(
-                style=novel_other_settings.get("style", ""),
-                genre_code=genre_code,
-                mood_code=mood_code,
-                text_length=text_length,
-                title=novelist.other_novel_data.get("title", "untitled"),
-                overall_plot=novelist.plot,
-                short_summary=novelist.other_novel_data.get("summary", ""),
-                user_id=user_data.id,
-                status=NovelStatus.GENERATING,
-                true_text_length=0,
-                init_data=novelist.init_data,  # リトライ時のために保存
-            )
-            db.session.add(novel_data)
-            db.session.commit()
-            logger.info("new novel was registered to db")
-
-            # 章のデータベースを作成する
-            for i in range(novelist.chapter_count):
-                chapter = Chapter(
-                    chapter_number=i + 1,
-                    content="NO CONTENT",
-                    novel_id=novel_data.id,
-                    status=NovelStatus.PENDING,
-                    plot=novelist.chapter_plots[i].get("plot"),
+            # （IDはここで採番し、コミット後にORMインスタンスを読み直さずに済むようにする）
+            novel_id = uuid4().hex
+            title = novelist.other_novel_data.get("title", "untitled")
+            db.session.execute(
+                db.insert(Novel).values(
+                    id=novel_id,
+                    style=novel_other_settings.get("style", ""),
+                    genre_code=genre_code,
+                    mood_code=mood_code,
+                    text_length=text_length,
+                    title=title,
+                    overall_plot=novelist.plot,
+                    short_summary=novelist.other_novel_data.get("summary", ""),
+                    user_id=user_id,
+                    status=NovelStatus.GENERATING,
+                    true_text_length=0,
+                    init_data=novelist.init_data,  # リトライ時のために保存
                 )
-                db.session.add(chapter)
-            db.session.commit()
-            logger.info(f"{novelist.chapter_count} chapters was registered to db")
+            )
 
-            # 1章の生成開始をデータベースに記録
-            first_chapter = db.session.query(Chapter).filter_by(novel_id=novel_data.id, chapter_number=1).first()
-            first_chapter.status = NovelStatus.GENERATING
+            # 章のデータベースを作成する（全章を1回のINSERTでまとめて登録）
+            # 章IDはここで採番し、バックグラウンドタスクに章番号→章IDの対応として渡す
+            # 1章はこの後すぐに生成するため、生成中として登録する
+            chapter_ids = {i + 1: uuid4().hex for i in range(novelist.chapter_count)}
+            db.session.execute(
+                db.insert(Chapter),
+                [
+                    {
+                        "id": chapter_ids[i + 1],
+                        "chapter_number": i + 1,
+                        "content": "NO CONTENT",
+                        "novel_id": novel_id,
+                        "status": NovelStatus.GENERATING if i == 0 else NovelStatus.PENDING,
+                        "plot": novelist.chapter_plots[i].get("plot"),
+                    }
+                    for i in range(novelist.chapter_count)
+                ],
+            )
             db.session.commit()
+            logger.info(f"new novel and {novelist.chapter_count} chapters was registered to db")
 
             # 1章生成
             logger.info("start to generate chapter")
@@ -567,18 +851,22 @@ class NovelInit(Resource):
             logger.info("finished generating chapter")
 
             # データベース記録
-            first_chapter.content = chapter
-            first_chapter.status = NovelStatus.COMPLETED
-            content_length = len(chapter)
-            novel_data.true_text_length += content_length
+            db.session.execute(
+                db.update(Chapter)
+                .where(Chapter.id == chapter_ids[1])
+                .values(content=chapter, status=NovelStatus.COMPLETED)
+            )
+            db.session.execute(
+                db.update(Novel)
+                .where(Novel.id == novel_id)
+                .values(true_text_length=Novel.true_text_length + len(chapter))
+            )
             db.session.commit()
-            trd = threading.Thread(target=novelist_bg_task_runner, args=(novelist, novel_data.id))
-            trd.daemon = False
-            trd.start()
+            submit_bg_task(novel_id, chapter_ids, novelist.next_chapter_num)
 
             return {
-                "novel_id": str(novel_data.id),
-                "title": novel_data.title,
+                "novel_id": novel_id,
+                "title": title,
                 "total_chapter_number": novelist.chapter_count,
                 "first_chapter_text": chapter,
             }, 200
@@ -591,10 +879,12 @@ class NovelInit(Resource):
 class NovelText(Resource):
     @api.doc("get_text", params={"novel_id": "小説のID"})
     @api.expect(novels_text_parser)
-    @api.marshal_with(novel_text_model)
+    @api.response(200, "結合された本文", novel_text_model)
     def get(self, novel_id):
         """小説idから作成済みのチャプター本文を結合して返す
 
+        本文は全章分を結合した文字列をメモリ上に作らず、章ごとにJSON文字列へエスケープして逐次送信します。
+
         Args:
             novel_id (str): 小説ID
 
@@ -609,33 +899,56 @@ class NovelText(Resource):
                 has_all_chapters(boolean):生成予定のチャプターがすべて結合され、全文が返ったか
                 }
         """
-        novel = db.session.get(Novel, novel_id)
         user_id = request.headers.get("X-User-ID")
         # 認証情報なしエラー.
         if not user_id:
             api.abort(401, "Authorization header 'X-User-ID' is required")
+        # 小説の所有者・全章数・最初の未完成の章番号と、ETag用の最終更新日時を1回の集計で取得する（本文は読み込まない）
+        row = db.session.execute(
+            db.select(
+                Novel.user_id,
+                db.func.count(Chapter.id),
+                db.func.min(db.case((Chapter.status != NovelStatus.COMPLETED, Chapter.chapter_number))),
+                db.func.max(Chapter.updated_at),
+            )
+            .outerjoin(Chapter, Chapter.novel_id == Novel.id)
+            .where(Novel.id == novel_id)
+            .group_by(Novel.id)
+        ).first()
         # 小説なしエラー.
-        if not novel:
+        if row is None:
             api.abort(404, f"Novel not found - id:{novel_id}")
+        owner_id, total_chapter_number, next_incomplete_chapter, last_updated = row
         # ユーザーの権限なしエラー.
-        if novel.user_id != user_id:
+        if owner_id != user_id:
             api.abort(403, "You do not have permission to access this novel")
-        chapters = db.session.query(Chapter).filter_by(novel_id=novel_id).order_by(Chapter.chapter_number).all()
-        text = ""
-        count = 0
-        for i in range(len(chapters)):
-            chapter = chapters[i]
-            if chapter.status != NovelStatus.COMPLETED:
-                break
-            text += chapter.content + "\n"
-            count += 1
-        return {
-            "text": text,
+        headers = check_etag(novel_id, total_chapter_number, last_updated)
+
+        # 先頭から連続して完成している章（最初の未完成の章の手前まで）の本文のみを返す
+        count = total_chapter_number if next_incomplete_chapter is None else next_incomplete_chapter - 1
+        rest = {
             "last_chapter": count,
-            "total_chapter_number": len(chapters),
-            "has_all_chapters": count == len(chapters),
+            "total_chapter_number": total_chapter_number,
+            "has_all_chapters": count == total_chapter_number,
         }
 
+        def text_body():
+            # {"text": "<各章の本文 + 改行>", ...} を組み立てながら送信する
+            yield b'{"text":"'
+            if count > 0:
+                contents = db.session.scalars(
+                    db.select(Chapter.content)
+                    .where(Chapter.novel_id == novel_id, Chapter.chapter_number <= count)
+                    .order_by(Chapter.chapter_number)
+                    .execution_options(yield_per=100)
+                )
+                for content in contents:
+                    # JSON文字列としてエスケープし、前後の引用符を除いて連結する
+                    yield orjson.dumps(content)[1:-1] + b"\\n"
+            yield b'",' + orjson.dumps(rest)[1:] + b"\n"
+
+        return Response(stream_with_context(text_body()), mimetype="application/json", headers=headers)
+
 
 @api.route("/<string:novel_id>/retries")
 class NovelRetries(Resource):
@@ -656,7 +969,7 @@ class NovelRetries(Resource):
         """
         try:
             # リクエストボディからuser_idを取得
-            requested_param = request.get_json()
+            requested_param = request.get_json(cache=False)
             if not requested_param:
                 api.abort(400, "Request body is required")
 
@@ -666,8 +979,12 @@ class NovelRetries(Resource):
             if not user_id:
                 api.abort(400, "'user_id' is required in request body")
 
-            # 小説の取得
-            novel = db.session.get(Novel, novel_id)
+            # 小説と全チャプターを1回の問い合わせで取得
+            novel = (
+                db.session.execute(db.select(Novel).options(db.joinedload(Novel.chapters)).where(Novel.id == novel_id))
+                .unique()
+                .scalar_one_or_none()
+            )
             if not novel:
                 api.abort(404, f"Novel not found - id:{novel_id}")
 
@@ -683,35 +1000,41 @@ class NovelRetries(Resource):
             if not novel.init_data:
                 api.abort(500, "Novel init_data not found. Cannot retry generation.")
 
-            # 全チャプターを取得
-            chapters = db.session.query(Chapter).filter_by(novel_id=novel_id).order_by(Chapter.chapter_number).all()
+            # 章はリレーションの定義により章番号順で読み込まれる
+            chapters = novel.chapters
+            # バックグラウンドタスクに渡す章IDはコミット前に組み立てる
+            # （コミット後は各章のインスタンスが期限切れになり、属性の参照ごとにSELECTが発行されるため）
+            chapter_ids = {chapter.chapter_number: chapter.id for chapter in chapters}
 
             # 最初のFAILED章を特定
             failed_chapter = None
-            for chapter in chapters:
+            failed_index = 0
+            for failed_index, chapter in enumerate(chapters):
                 if chapter.status == NovelStatus.FAILED:
                     failed_chapter = chapter
                     break
 
             if not failed_chapter:
                 api.abort(400, "No FAILED chapter found in this novel")
+            failed_chapter_number = failed_chapter.chapter_number
 
-            logger.info(f"Retrying chapter {failed_chapter.chapter_number} for novel {novel_id}")
+            logger.info(f"Retrying chapter {failed_chapter_number} for novel {novel_id}")
 
             # 前章の内容を取得（第1章の場合はNone）
+            # 章は章番号順に並んでいるため、読み込み済みのリストから直前の要素を参照する
             previous_content = None
-            if failed_chapter.chapter_number > 1:
-                previous_chapter = (
-                    db.session.query(Chapter)
-                    .filter_by(novel_id=novel_id, chapter_number=failed_chapter.chapter_number - 1)
-                    .first()
-                )
-                if previous_chapter and previous_chapter.status == NovelStatus.COMPLETED:
+            if failed_chapter_number > 1:
+                previous_chapter = chapters[failed_index - 1] if failed_index > 0 else None
+                if (
+                    previous_chapter
+                    and previous_chapter.chapter_number == failed_chapter_number - 1
+                    and previous_chapter.status == NovelStatus.COMPLETED
+                ):
                     previous_content = previous_chapter.content
                 else:
                     api.abort(
                         500,
-                        f"Previous chapter (#{failed_chapter.chapter_number - 1}) is not completed. "
+                        f"Previous chapter (#{failed_chapter_number - 1}) is not completed. "
                         "Cannot retry from this chapter.",
                     )
 
@@ -724,9 +1047,11 @@ class NovelRetries(Resource):
             # 失敗した章を再生成
             failed_chapter.status = NovelStatus.GENERATING
             db.session.commit()
+            # 章がFAILEDではなくなったため、FAILEDの一覧のキャッシュを破棄する
+            invalidate_failed_cache()
 
             chapter_content = novelist.retry_failed_chapter(
-                chapter_number=failed_chapter.chapter_number, previous_content=previous_content
+                chapter_number=failed_chapter_number, previous_content=previous_content
             )
 
             # データベース更新
@@ -736,23 +1061,19 @@ class NovelRetries(Resource):
             novel.status = NovelStatus.GENERATING
             novel.true_text_length += content_length
             db.session.commit()
+            # 小説がFAILEDではなくなったため、FAILEDの一覧のキャッシュを破棄する
+            invalidate_failed_cache()
 
-            logger.info(f"Chapter {failed_chapter.chapter_number} successfully regenerated")
+            logger.info(f"Chapter {failed_chapter_number} successfully regenerated")
 
             # 後続章の生成を再開
-            # next_chapter_numとprevious_chapter_contentを設定
-            novelist.next_chapter_num = failed_chapter.chapter_number + 1
-            novelist.previous_chapter_content = chapter_content
+            # (Novelistと前章の本文はバックグラウンドタスク内で再構築する)
+            next_chapter_num = failed_chapter_number + 1
 
             # バックグラウンドタスクを起動
-            if novelist.next_chapter_num <= novelist.chapter_count:
-                trd = threading.Thread(
-                    target=novelist_bg_task_runner,
-                    args=(novelist, novel_id, novelist.next_chapter_num),
-                )
-                trd.daemon = False
-                trd.start()
-                logger.info(f"Background task restarted from chapter {novelist.next_chapter_num}")
+            if next_chapter_num <= novelist.chapter_count:
+                submit_bg_task(novel_id, chapter_ids, next_chapter_num)
+                logger.info(f"Background task restarted from chapter {next_chapter_num}")
             else:
                 # すでに全章完了している場合
                 novel.status = NovelStatus.COMPLETED
@@ -761,7 +1082,7 @@ class NovelRetries(Resource):
 
             return {
                 "novel_id": novel_id,
-                "retried_chapter": failed_chapter.chapter_number,
+                "retried_chapter": failed_chapter_number,
                 "chapter_content": chapter_content,
             }, 200
 
@@ -791,7 +1112,7 @@ class NovelFavorite(Resource):
         """
         try:
             novel = db.session.get(Novel, novel_id)
-            req_param = request.get_json()
+            req_param = request.get_json(cache=False)
             user_id = req_param.get("user_id", "")
             if not req_param:
                 api.abort(400, "Request body is required")
@@ -9,6 +9,7 @@ from flask import Flask
 
 from src.database import db
 from src.models import Genre
+from src.services.novel_cache import clear_master_cache
 
 # 固定ジャンル一覧: code = 内部スラッグ, genre = 日本語表示名
 GENRES: List[Dict[str, str]] = [
@@ -30,12 +31,14 @@ def seed_genres(app: Flask) -> None:
         app (Flask): Flask アプリケーションインスタンス (アプリコンテキスト取得用)
     """
     with app.app_context():
-        # 既存ジャンルコード集合を取得
-        existing_codes = {g.code for g in db.session.query(Genre.code).all()}
-        created = 0  # 今回追加した件数
-        for g in GENRES:
-            if g["code"] not in existing_codes:
-                db.session.add(Genre(code=g["code"], genre=g["genre"]))
-                created += 1
-        if created:
+        # 既存ジャンルコード集合を取得（固定一覧に含まれるコードのみ）
+        existing_codes = set(
+            db.session.scalars(db.select(Genre.code).where(Genre.code.in_([g["code"] for g in GENRES])))
+        )
+        # 未登録のものを1回のINSERTでまとめて登録
+        missing = [g for g in GENRES if g["code"] not in existing_codes]
+        if missing:
+            db.session.execute(db.insert(Genre), missing)
             db.session.commit()
+            # キャッシュ済みのコード一覧を破棄
+            clear_master_cache()
@@ -9,6 +9,7 @@ from flask import Flask
 
 from src.database import db
 from src.models import Mood
+from src.services.novel_cache import clear_master_cache
 
 # 固定ムード一覧: code = 内部スラッグ, mood = 日本語表示名
 MOODS: List[Dict[str, str]] = [
@@ -28,12 +29,12 @@ def seed_moods(app: Flask) -> None:
         app (Flask): Flask アプリケーションインスタンス (アプリコンテキスト取得用)
     """
     with app.app_context():
-        # 既存の雰囲気コード集合を取得
-        existing_codes = {g.code for g in db.session.query(Mood.code).all()}
-        created = 0  # 今回追加した件数
-        for g in MOODS:
-            if g["code"] not in existing_codes:
-                db.session.add(Mood(code=g["code"], mood=g["mood"]))
-                created += 1
-        if created:
+        # 既存の雰囲気コード集合を取得（固定一覧に含まれるコードのみ）
+        existing_codes = set(db.session.scalars(db.select(Mood.code).where(Mood.code.in_([g["code"] for g in MOODS]))))
+        # 未登録のものを1回のINSERTでまとめて登録
+        missing = [g for g in MOODS if g["code"] not in existing_codes]
+        if missing:
+            db.session.execute(db.insert(Mood), missing)
             db.session.commit()
+            # キャッシュ済みのコード一覧を破棄
+            clear_master_cache()
@@ -5,16 +5,142 @@ NovelとChapterのステータス更新、エラー情報の記録、復旧処
 """
 
 import logging
-from datetime import datetime
-from typing import List, Optional
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session, scoped_session
 
 from src.database import db
 from src.models import Chapter, Novel, NovelStatus
-from src.services.gemini_exceptions import GeminiAPIError
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# 更新日時に使用するタイムゾーン
+_UTC = timezone.utc
+
+# 一括更新時の1回あたりの最大件数（PostgreSQLのパケットサイズ上限を超えないようにする）
+BULK_UPDATE_BATCH_SIZE = 500
+
+# FAILEDの小説・章の一覧: キー -> (有効期限, 結果)
+# 管理画面などから短い間隔で繰り返し取得されるため、ステータス更新時に破棄する短命のキャッシュを持つ
+FAILED_CACHE_TTL = 5.0
+FAILED_CACHE_MAX_ENTRIES = 128
+_failed_cache: Dict[tuple, Tuple[float, list]] = {}
+_failed_cache_lock = threading.Lock()
+
+
+def _get_failed_cache(key: tuple) -> Optional[list]:
+    with _failed_cache_lock:
+        entry = _failed_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, result = entry
+        if expires_at < time.monotonic():
+            del _failed_cache[key]
+            return None
+        return list(result)
+
+
+def _set_failed_cache(key: tuple, result: list) -> None:
+    with _failed_cache_lock:
+        _failed_cache.pop(key, None)
+        while len(_failed_cache) >= FAILED_CACHE_MAX_ENTRIES:
+            del _failed_cache[next(iter(_failed_cache))]
+        _failed_cache[key] = (time.monotonic() + FAILED_CACHE_TTL, list(result))
+
+
+def invalidate_failed_cache() -> None:
+    """FAILEDの小説・章の一覧のキャッシュを破棄する
+
+    ステータスを更新した後に呼び出し、次回の get_failed_novels / get_failed_chapters でDBから再取得させます。
+    """
+    with _failed_cache_lock:
+        _failed_cache.clear()
+
+
+def _resolve_session(db_session=None) -> Session:
+    """使用するセッションを求める
+
+    db.session（scoped_session）はメソッド呼び出しのたびにスレッドごとのセッションを探すため、
+    関数の先頭で実体のSessionを一度だけ取り出し、以降はそれを直接使用します。
+
+    Args:
+        db_session: データベースセッション（Noneの場合はdb.sessionを使用）
+
+    Returns:
+        Session: 実体のセッション
+    """
+    session = db.session if db_session is None else db_session
+    return session() if isinstance(session, scoped_session) else session
+
+
+def _mark_novel_failed_nocommit(session, novel_id: str):
+    """小説をFAILEDに更新する（コミットは呼び出し元で行う）
+
+    Returns:
+        Row | None: 更新した小説の (title)。見つからない場合はNone
+    """
+    return session.execute(
+        db.update(Novel)
+        .where(Novel.id == novel_id)
+        .values(status=NovelStatus.FAILED, updated_at=db.func.now())
+        .returning(Novel.title)
+    ).first()
+
+
+def _mark_chapter_failed_nocommit(session, chapter_id: str):
+    """チャプターをFAILEDに更新する（コミットは呼び出し元で行う）
+
+    Returns:
+        Row | None: 更新したチャプターの (novel_id, chapter_number)。見つからない場合はNone
+    """
+    return session.execute(
+        db.update(Chapter)
+        .where(Chapter.id == chapter_id)
+        .values(status=NovelStatus.FAILED, updated_at=db.func.now())
+        .returning(Chapter.novel_id, Chapter.chapter_number)
+    ).first()
+
+
+def _mark_chapters_failed_nocommit(session, chapter_ids: List[str], batch_size: int) -> None:
+    """複数のチャプターを batch_size 件ずつFAILEDに更新する（コミットは呼び出し元で行う）"""
+    for start in range(0, len(chapter_ids), batch_size):
+        session.execute(
+            db.update(Chapter)
+            .where(Chapter.id.in_(chapter_ids[start : start + batch_size]))
+            .values(status=NovelStatus.FAILED, updated_at=db.func.now())
+        )
+
+
+def _log_novel_failed(
+    novel_id: str, title: str, failed_chapter_number: Optional[int], error_message: str, error_type: Optional[str]
+) -> None:
+    error_info = f"Type: {error_type}, " if error_type else ""
+    chapter_info = f"Failed chapter: {failed_chapter_number}, " if failed_chapter_number else ""
+    logger.error(
+        "Novel marked as FAILED - ID: %s, Title: '%s', %s%sMessage: %s",
+        novel_id,
+        title,
+        chapter_info,
+        error_info,
+        error_message,
+    )
+
+
+def _log_chapter_failed(chapter_id: str, chapter, error_message: str, error_type: Optional[str]) -> None:
+    error_info = f"Type: {error_type}, " if error_type else ""
+    logger.error(
+        "Chapter marked as FAILED - Chapter ID: %s, Novel ID: %s, Chapter Number: %s, %sMessage: %s",
+        chapter_id,
+        chapter.novel_id,
+        chapter.chapter_number,
+        error_info,
+        error_message,
+    )
+
 
 def mark_novel_as_failed(
     novel_id: str,
@@ -48,50 +174,36 @@ def mark_novel_as_failed(
         ... )
         True
     """
-    session = db_session or db.session
+    session = _resolve_session(db_session)
 
     try:
-        # 小説を取得
-        novel = session.get(Novel, novel_id)
-        if not novel:
-            logger.error(f"Novel not found for marking as failed: {novel_id}")
+        # 小説のステータスを更新（SELECTせずにUPDATEし、ログ用の値はRETURNINGで受け取る）
+        novel = _mark_novel_failed_nocommit(session, novel_id)
+        if novel is None:
+            logger.error("Novel not found for marking as failed: %s", novel_id)
+            # 該当行がなくてもUPDATEでトランザクション（SQLiteでは書き込みロック）が開始されているため終了させる
+            session.rollback()
             return False
 
-        # 小説のステータスを更新
-        novel.status = NovelStatus.FAILED
-        novel.updated_at = datetime.now(timezone.utc)
-
         # 特定の章が失敗した場合、その章だけをFAILEDにする
+        failed_chapter_number = None
         if failed_chapter_id:
-            failed_chapter = session.get(Chapter, failed_chapter_id)
-            if failed_chapter:
-                failed_chapter.status = NovelStatus.FAILED
-                failed_chapter.updated_at = datetime.now(timezone.utc)
+            failed_chapter = _mark_chapter_failed_nocommit(session, failed_chapter_id)
+            if failed_chapter is not None:
                 failed_chapter_number = failed_chapter.chapter_number
             else:
-                logger.warning(f"Failed chapter not found: {failed_chapter_id}")
-                failed_chapter_number = None
-        else:
-            failed_chapter_number = None
+                logger.warning("Failed chapter not found: %s", failed_chapter_id)
 
         session.commit()
+        invalidate_failed_cache()
 
         # ログに記録
-        error_info = f"Type: {error_type}, " if error_type else ""
-        chapter_info = f"Failed chapter: {failed_chapter_number}, " if failed_chapter_number else ""
-        logger.error(
-            f"Novel marked as FAILED - "
-            f"ID: {novel_id}, "
-            f"Title: '{novel.title}', "
-            f"{chapter_info}"
-            f"{error_info}"
-            f"Message: {error_message}"
-        )
+        _log_novel_failed(novel_id, novel.title, failed_chapter_number, error_message, error_type)
 
         return True
 
     except Exception as e:
-        logger.error(f"Failed to mark novel as failed (ID: {novel_id}): {e}")
+        logger.error("Failed to mark novel as failed (ID: %s): %s", novel_id, e)
         session.rollback()
         return False
 
@@ -121,40 +233,81 @@ def mark_chapter_as_failed(
         ... )
         True
     """
-    session = db_session or db.session
+    session = _resolve_session(db_session)
 
     try:
-        # チャプターを取得
-        chapter = session.get(Chapter, chapter_id)
-        if not chapter:
-            logger.error(f"Chapter not found for marking as failed: {chapter_id}")
-            return False
-
         # チャプターのステータスを更新
-        chapter.status = NovelStatus.FAILED
-        chapter.updated_at = datetime.now(timezone.utc)
+        chapter = _mark_chapter_failed_nocommit(session, chapter_id)
+        if chapter is None:
+            logger.error("Chapter not found for marking as failed: %s", chapter_id)
+            session.rollback()
+            return False
 
         session.commit()
+        invalidate_failed_cache()
 
         # ログに記録
-        error_info = f"Type: {error_type}, " if error_type else ""
-        logger.error(
-            f"Chapter marked as FAILED - "
-            f"Chapter ID: {chapter_id}, "
-            f"Novel ID: {chapter.novel_id}, "
-            f"Chapter Number: {chapter.chapter_number}, "
-            f"{error_info}"
-            f"Message: {error_message}"
-        )
+        _log_chapter_failed(chapter_id, chapter, error_message, error_type)
 
         return True
 
     except Exception as e:
-        logger.error(f"Failed to mark chapter as failed (ID: {chapter_id}): {e}")
+        logger.error("Failed to mark chapter as failed (ID: %s): %s", chapter_id, e)
         session.rollback()
         return False
 
 
+def bulk_mark_chapters_as_failed(
+    chapter_ids: Iterable[str],
+    error_message: str,
+    error_type: Optional[str] = None,
+    db_session=None,
+    batch_size: int = BULK_UPDATE_BATCH_SIZE,
+) -> bool:
+    """複数のチャプターのステータスをまとめてFAILEDに更新する
+
+    チャプターごとにSELECT・UPDATE・COMMITを繰り返さず、
+    batch_size 件ずつ UPDATE ... WHERE id IN (...) を発行し、最後に1回だけコミットします。
+
+    Args:
+        chapter_ids: チャプターのIDのリスト
+        error_message: エラーメッセージ
+        error_type: エラーの種類
+        db_session: データベースセッション
+        batch_size: 1回のUPDATEでまとめる件数
+
+    Returns:
+        bool: 更新が成功した場合True、失敗した場合False
+
+    Example:
+        >>> bulk_mark_chapters_as_failed(
+        ...     chapter_ids=["def456", "ghi789"],
+        ...     error_message="Rate limit exceeded",
+        ...     error_type="RateLimitError"
+        ... )
+        True
+    """
+    chapter_ids = list(chapter_ids)
+    if not chapter_ids:
+        return True
+
+    session = _resolve_session(db_session)
+
+    try:
+        _mark_chapters_failed_nocommit(session, chapter_ids, batch_size)
+        session.commit()
+        invalidate_failed_cache()
+
+    except Exception as e:
+        logger.error("Failed to bulk mark chapters as failed (Count: %s): %s", len(chapter_ids), e)
+        session.rollback()
+        return False
+
+    error_info = f"Type: {error_type}, " if error_type else ""
+    logger.error("Chapters marked as FAILED - Count: %s, %sMessage: %s", len(chapter_ids), error_info, error_message)
+    return True
+
+
 def recover_novel_status(novel_id: str, new_status: NovelStatus = NovelStatus.GENERATING, db_session=None) -> bool:
     """小説のステータスをFAILEDから復旧する
 
@@ -172,32 +325,31 @@ def recover_novel_status(novel_id: str, new_status: NovelStatus = NovelStatus.GE
         >>> recover_novel_status("abc123", NovelStatus.GENERATING)
         True
     """
-    session = db_session or db.session
+    session = _resolve_session(db_session)
 
     try:
-        # 小説を取得
-        novel = session.get(Novel, novel_id)
-        if not novel:
-            logger.error(f"Novel not found for recovery: {novel_id}")
+        novel = session.execute(
+            db.update(Novel)
+            .where(Novel.id == novel_id)
+            .values(status=new_status, updated_at=db.func.now())
+            .returning(Novel.title)
+        ).first()
+        if novel is None:
+            logger.error("Novel not found for recovery: %s", novel_id)
+            session.rollback()
             return False
 
-        old_status = novel.status
-        novel.status = new_status
-        novel.updated_at = datetime.now(timezone.utc)
-
         session.commit()
+        invalidate_failed_cache()
 
         logger.info(
-            f"Novel status recovered - "
-            f"ID: {novel_id}, "
-            f"Title: '{novel.title}', "
-            f"Status: {old_status.value} -> {new_status.value}"
+            "Novel status recovered - ID: %s, Title: '%s', Status: -> %s", novel_id, novel.title, new_status.value
         )
 
         return True
 
     except Exception as e:
-        logger.error(f"Failed to recover novel status (ID: {novel_id}): {e}")
+        logger.error("Failed to recover novel status (ID: %s): %s", novel_id, e)
         session.rollback()
         return False
 
@@ -219,33 +371,35 @@ def recover_chapter_status(chapter_id: str, new_status: NovelStatus = NovelStatu
         >>> recover_chapter_status("def456", NovelStatus.COMPLETED)
         True
     """
-    session = db_session or db.session
+    session = _resolve_session(db_session)
 
     try:
-        # チャプターを取得
-        chapter = session.get(Chapter, chapter_id)
-        if not chapter:
-            logger.error(f"Chapter not found for recovery: {chapter_id}")
+        chapter = session.execute(
+            db.update(Chapter)
+            .where(Chapter.id == chapter_id)
+            .values(status=new_status, updated_at=db.func.now())
+            .returning(Chapter.novel_id, Chapter.chapter_number)
+        ).first()
+        if chapter is None:
+            logger.error("Chapter not found for recovery: %s", chapter_id)
+            session.rollback()
             return False
 
-        old_status = chapter.status
-        chapter.status = new_status
-        chapter.updated_at = datetime.now(timezone.utc)
-
         session.commit()
+        invalidate_failed_cache()
 
         logger.info(
-            f"Chapter status recovered - "
-            f"Chapter ID: {chapter_id}, "
-            f"Novel ID: {chapter.novel_id}, "
-            f"Chapter Number: {chapter.chapter_number}, "
-            f"Status: {old_status.value} -> {new_status.value}"
+            "Chapter status recovered - Chapter ID: %s, Novel ID: %s, Chapter Number: %s, Status: -> %s",
+            chapter_id,
+            chapter.novel_id,
+            chapter.chapter_number,
+            new_status.value,
         )
 
         return True
 
     except Exception as e:
-        logger.error(f"Failed to recover chapter status (ID: {chapter_id}): {e}")
+        logger.error("Failed to recover chapter status (ID: %s): %s", chapter_id, e)
         session.rollback()
         return False
 
@@ -256,6 +410,9 @@ def get_failed_novels(db_session=None) -> List[Novel]:
     エラーで失敗した小説のリストを取得します。
     手動復旧やデバッグに使用できます。
 
+    db_session を指定しない場合、結果は FAILED_CACHE_TTL 秒間キャッシュされます。
+    キャッシュした小説はセッションから切り離されるため、参照のみに使用してください。
+
     Args:
         db_session: データベースセッション
 
@@ -267,58 +424,124 @@ def get_failed_novels(db_session=None) -> List[Novel]:
         >>> for novel in failed_novels:
         ...     print(f"Failed: {novel.title}")
     """
-    session = db_session or db.session
+    if db_session is None:
+        cached = _get_failed_cache(("novels",))
+        if cached is not None:
+            return cached
+
+    session = _resolve_session(db_session)
 
     try:
         failed_novels = session.query(Novel).filter_by(status=NovelStatus.FAILED).all()
+        if db_session is None:
+            for novel in failed_novels:
+                session.expunge(novel)
+            _set_failed_cache(("novels",), failed_novels)
         return failed_novels
     except Exception as e:
-        logger.error(f"Failed to retrieve failed novels: {e}")
+        logger.error("Failed to retrieve failed novels: %s", e)
         return []
 
 
-def get_failed_chapters(novel_id: str, db_session=None) -> List[Chapter]:
+def get_failed_chapters(
+    novel_id: str, db_session=None, limit: int = 100, offset: int = 0, columns_only: bool = False
+) -> list:
     """特定の小説のFAILEDチャプター一覧を取得する
 
+    章番号順に limit 件ずつ取得します。
+    columns_only を指定すると本文などを読み込まず、(id, chapter_number, updated_at) の行のみを返します。
+    絞り込みと並び替えには ix_chapters_novel_id_chapter_number_status が使われます。
+
+    db_session を指定しない場合、結果は FAILED_CACHE_TTL 秒間キャッシュされます。
+    キャッシュしたチャプターはセッションから切り離されるため、参照のみに使用してください。
+
     Args:
         novel_id: 小説のID
         db_session: データベースセッション
+        limit: 取得する最大件数
+        offset: 取得を開始する位置
+        columns_only: Trueの場合、ID・章番号・更新日時のみを取得する
 
     Returns:
-        List[Chapter]: FAILEDステータスのチャプターのリスト
+        list: FAILEDステータスのチャプター（columns_only の場合は (id, chapter_number, updated_at) の行）のリスト
 
     Example:
         >>> failed_chapters = get_failed_chapters("abc123")
         >>> for chapter in failed_chapters:
         ...     print(f"Failed chapter: {chapter.chapter_number}")
     """
-    session = db_session or db.session
+    cache_key = ("chapters", novel_id, limit, offset, columns_only)
+    if db_session is None:
+        cached = _get_failed_cache(cache_key)
+        if cached is not None:
+            return cached
+
+    session = _resolve_session(db_session)
 
     try:
-        failed_chapters = (
-            session.query(Chapter)
-            .filter_by(novel_id=novel_id, status=NovelStatus.FAILED)
-            .order_by(Chapter.chapter_number)
-            .all()
-        )
+        if columns_only:
+            failed_chapters = session.execute(
+                db.select(Chapter.id, Chapter.chapter_number, Chapter.updated_at)
+                .where(Chapter.novel_id == novel_id, Chapter.status == NovelStatus.FAILED)
+                .order_by(Chapter.chapter_number)
+                .limit(limit)
+                .offset(offset)
+            ).all()
+        else:
+            failed_chapters = (
+                session.query(Chapter)
+                .filter_by(novel_id=novel_id, status=NovelStatus.FAILED)
+                .order_by(Chapter.chapter_number)
+                .limit(limit)
+                .offset(offset)
+                .all()
+            )
+        if db_session is None:
+            if not columns_only:
+                for chapter in failed_chapters:
+                    session.expunge(chapter)
+            _set_failed_cache(cache_key, failed_chapters)
         return failed_chapters
     except Exception as e:
-        logger.error(f"Failed to retrieve failed chapters for novel {novel_id}: {e}")
+        logger.error("Failed to retrieve failed chapters for novel %s: %s", novel_id, e)
         return []
 
 
-def handle_chapter_generation_failure(novel_id: str, chapter_id: str, error: Exception, db_session=None) -> None:
+def _describe_error(error: Exception) -> Tuple[str, str]:
+    """ログ・エラー記録用にエラーメッセージとエラーの種類を求める
+
+    GeminiAPIErrorの文字列表現にはfinish_reasonと詳細情報が含まれているため、そのまま使用します。
+
+    Args:
+        error: 発生したエラー
+
+    Returns:
+        Tuple[str, str]: (エラーメッセージ, エラーの種類)
+    """
+    return str(error), type(error).__name__
+
+
+def handle_chapter_generation_failure(
+    novel_id: str,
+    chapter_id: str,
+    error: Exception,
+    db_session=None,
+    chapter_ids: Optional[List[str]] = None,
+) -> None:
     """章の生成が完全に失敗した場合の処理
 
     リトライが全て失敗した章について、章と小説のステータスを更新します。
     章はFAILEDにマークされ、小説全体もFAILEDになります。
     これにより、それ以降の章の生成が停止されます。
+    複数の章がまとめて失敗した場合は chapter_ids を渡すと一括で更新します。
+    章と小説の更新は1つのトランザクションで行い、コミットは1回だけです。
 
     Args:
         novel_id: 小説のID
         chapter_id: 失敗した章のID
         error: 発生したエラー
         db_session: データベースセッション
+        chapter_ids: 同時に失敗した章のIDのリスト（chapter_id 以外も含めて一括でFAILEDにする場合）
 
     Example:
         >>> try:
@@ -327,29 +550,50 @@ def handle_chapter_generation_failure(novel_id: str, chapter_id: str, error: Exc
         ...     handle_chapter_generation_failure(novel_id, chapter_id, e)
         ...     return  # 生成を停止
     """
-    error_message = str(error)
-    error_type = type(error).__name__
-
-    # Gemini API関連のエラーの場合、詳細情報を取得
-    if isinstance(error, GeminiAPIError):
-        if hasattr(error, "finish_reason") and error.finish_reason:
-            error_message += f" (finish_reason: {error.finish_reason})"
-        if hasattr(error, "details") and error.details:
-            error_message += f" | Details: {error.details}"
-
-    # 章をFAILEDにマーク
-    mark_chapter_as_failed(
-        chapter_id=chapter_id, error_message=error_message, error_type=error_type, db_session=db_session
-    )
+    error_message, error_type = _describe_error(error)
 
-    # 小説全体もFAILEDにマーク（この章で生成停止）
-    mark_novel_as_failed(
-        novel_id=novel_id,
-        error_message=f"Chapter generation failed: {error_message}",
-        error_type=error_type,
-        failed_chapter_id=chapter_id,
-        db_session=db_session,
-    )
+    session = _resolve_session(db_session)
+    other_chapter_ids = [cid for cid in dict.fromkeys(chapter_ids or []) if cid != chapter_id]
+
+    try:
+        # 章をFAILEDにマーク
+        failed_chapter = _mark_chapter_failed_nocommit(session, chapter_id)
+        if other_chapter_ids:
+            _mark_chapters_failed_nocommit(session, other_chapter_ids, BULK_UPDATE_BATCH_SIZE)
+
+        # 小説全体もFAILEDにマーク（この章で生成停止）
+        novel = _mark_novel_failed_nocommit(session, novel_id)
+
+        session.commit()
+        invalidate_failed_cache()
+
+    except Exception as e:
+        logger.error(
+            "Failed to mark chapter generation failure (Novel ID: %s, Chapter ID: %s): %s", novel_id, chapter_id, e
+        )
+        session.rollback()
+        return
+
+    # ログに記録
+    if failed_chapter is not None:
+        _log_chapter_failed(chapter_id, failed_chapter, error_message, error_type)
+    else:
+        logger.error("Chapter not found for marking as failed: %s", chapter_id)
+    if other_chapter_ids:
+        error_info = f"Type: {error_type}, " if error_type else ""
+        logger.error(
+            "Chapters marked as FAILED - Count: %s, %sMessage: %s", len(other_chapter_ids), error_info, error_message
+        )
+    if novel is not None:
+        _log_novel_failed(
+            novel_id,
+            novel.title,
+            failed_chapter.chapter_number if failed_chapter is not None else None,
+            f"Chapter generation failed: {error_message}",
+            error_type,
+        )
+    else:
+        logger.error("Novel not found for marking as failed: %s", novel_id)
 
 
 def handle_generation_error(
@@ -372,15 +616,7 @@ def handle_generation_error(
         ... except GeminiAPIError as e:
         ...     handle_generation_error(e, novel_id="abc123")
     """
-    error_message = str(error)
-    error_type = type(error).__name__
-
-    # Gemini API関連のエラーの場合、詳細情報を取得
-    if isinstance(error, GeminiAPIError):
-        if hasattr(error, "finish_reason") and error.finish_reason:
-            error_message += f" (finish_reason: {error.finish_reason})"
-        if hasattr(error, "details") and error.details:
-            error_message += f" | Details: {error.details}"
+    error_message, error_type = _describe_error(error)
 
     # チャプターレベルのエラー
     if chapter_id:
@@ -396,7 +632,7 @@ def handle_generation_error(
 
     else:
         logger.warning(
-            f"Generation error occurred but no novel_id or chapter_id provided: {error_type}: {error_message}"
+            "Generation error occurred but no novel_id or chapter_id provided: %s: %s", error_type, error_message
         )
 
 
@@ -417,31 +653,84 @@ def update_chapter_status(chapter_id: str, status: NovelStatus, db_session=None)
         >>> update_chapter_status("def456", NovelStatus.GENERATING)
         True
     """
-    session = db_session or db.session
+    session = _resolve_session(db_session)
 
     try:
-        chapter = session.get(Chapter, chapter_id)
-        if not chapter:
-            logger.error(f"Chapter not found for status update: {chapter_id}")
+        chapter = session.execute(
+            db.update(Chapter)
+            .where(Chapter.id == chapter_id)
+            .values(status=status, updated_at=db.func.now())
+            .returning(Chapter.chapter_number)
+        ).first()
+        if chapter is None:
+            logger.error("Chapter not found for status update: %s", chapter_id)
+            session.rollback()
             return False
 
-        old_status = chapter.status
-        chapter.status = status
-        chapter.updated_at = datetime.now(timezone.utc)
-
         session.commit()
+        invalidate_failed_cache()
 
         logger.debug(
-            f"Chapter status updated - "
-            f"ID: {chapter_id}, "
-            f"Chapter Number: {chapter.chapter_number}, "
-            f"Status: {old_status.value} -> {status.value}"
+            "Chapter status updated - ID: %s, Chapter Number: %s, Status: -> %s",
+            chapter_id,
+            chapter.chapter_number,
+            status.value,
         )
 
         return True
 
     except Exception as e:
-        logger.error(f"Failed to update chapter status (ID: {chapter_id}): {e}")
+        logger.error("Failed to update chapter status (ID: %s): %s", chapter_id, e)
+        session.rollback()
+        return False
+
+
+def bulk_update_chapter_status(
+    chapter_statuses: Iterable[Tuple[str, NovelStatus]], db_session=None, batch_size: int = BULK_UPDATE_BATCH_SIZE
+) -> bool:
+    """複数のチャプターのステータスをまとめて更新する
+
+    (チャプターのID, 新しいステータス) の組をまとめて受け取り、
+    bulk_update_mappings で batch_size 件ずつUPDATEを発行します。コミットは最後の1回だけです。
+
+    Args:
+        chapter_statuses: (チャプターのID, 新しいステータス) のリスト
+        db_session: データベースセッション
+        batch_size: 1回のUPDATEでまとめる件数
+
+    Returns:
+        bool: 更新が成功した場合True、失敗した場合False
+
+    Example:
+        >>> bulk_update_chapter_status([("def456", NovelStatus.COMPLETED), ("ghi789", NovelStatus.PENDING)])
+        True
+    """
+    # executemany のパラメータにはSQL関数を渡せないため、更新日時はアプリケーション側で設定する
+    now = datetime.now(_UTC)
+    mappings = [{"id": chapter_id, "status": status, "updated_at": now} for chapter_id, status in chapter_statuses]
+    if not mappings:
+        return True
+
+    if not _bulk_update_chapters(mappings, db_session, batch_size):
+        return False
+
+    logger.debug("Chapter statuses updated - Count: %s", len(mappings))
+    return True
+
+
+def _bulk_update_chapters(mappings: List[dict], db_session, batch_size: int) -> bool:
+    """チャプターの一括更新を batch_size 件ずつ実行してコミットする"""
+    session = _resolve_session(db_session)
+
+    try:
+        for start in range(0, len(mappings), batch_size):
+            session.bulk_update_mappings(Chapter, mappings[start : start + batch_size])
+        session.commit()
+        invalidate_failed_cache()
+        return True
+
+    except Exception as e:
+        logger.error("Failed to bulk update chapters (Count: %s): %s", len(mappings), e)
         session.rollback()
         return False
 
@@ -463,30 +752,28 @@ def update_novel_status(novel_id: str, status: NovelStatus, db_session=None) ->
         >>> update_novel_status("abc123", NovelStatus.COMPLETED)
         True
     """
-    session = db_session or db.session
+    session = _resolve_session(db_session)
 
     try:
-        novel = session.get(Novel, novel_id)
-        if not novel:
-            logger.error(f"Novel not found for status update: {novel_id}")
+        novel = session.execute(
+            db.update(Novel)
+            .where(Novel.id == novel_id)
+            .values(status=status, updated_at=db.func.now())
+            .returning(Novel.title)
+        ).first()
+        if novel is None:
+            logger.error("Novel not found for status update: %s", novel_id)
+            session.rollback()
             return False
 
-        old_status = novel.status
-        novel.status = status
-        novel.updated_at = datetime.now(timezone.utc)
-
         session.commit()
+        invalidate_failed_cache()
 
-        logger.debug(
-            f"Novel status updated - "
-            f"ID: {novel_id}, "
-            f"Title: '{novel.title}', "
-            f"Status: {old_status.value} -> {status.value}"
-        )
+        logger.debug("Novel status updated - ID: %s, Title: '%s', Status: -> %s", novel_id, novel.title, status.value)
 
         return True
 
     except Exception as e:
-        logger.error(f"Failed to update novel status (ID: {novel_id}): {e}")
+        logger.error("Failed to update novel status (ID: %s): %s", novel_id, e)
         session.rollback()
         return False
@@ -31,17 +31,37 @@ class GeminiAPIError(Exception):
         self.response = response
         self.finish_reason = finish_reason
         self.details = details or {}
+        self._str = None
 
     def __str__(self):
-        base_msg = self.message
-        if self.finish_reason:
-            base_msg += f" (finish_reason: {self.finish_reason})"
-        if self.details:
-            base_msg += f" | Details: {self.details}"
-        return base_msg
+        # リトライのログなどで繰り返し文字列化されるため、初回に組み立てた文字列を再利用する
+        # （details はサブクラスの__init__で追加し終えた後に変更しない前提）
+        if self._str is None:
+            base_msg = self.message
+            if self.finish_reason:
+                base_msg += f" (finish_reason: {self.finish_reason})"
+            if self.details:
+                base_msg += f" | Details: {self.details}"
+            self._str = base_msg
+        return self._str
+
+
+class TransientGeminiError(GeminiAPIError):
+    """一時的なエラーの基底クラス
+
+    再試行で成功する可能性があるエラー（ネットワーク、タイムアウト、レート制限など）はこのクラスを継承します。
+    リトライデコレータはこのクラスでリトライ対象かどうかを判定します。
+    """
+
 
+class PermanentGeminiError(GeminiAPIError):
+    """構造的なエラーの基底クラス
+
+    再試行しても成功しないエラー（安全性フィルター、トークン上限、認証など）はこのクラスを継承します。
+    """
 
-class SafetyFilterError(GeminiAPIError):
+
+class SafetyFilterError(PermanentGeminiError):
     """安全性フィルターによってコンテンツがブロックされた場合のエラー
 
     Gemini APIの安全性フィルター（safety_ratings）によって、
@@ -71,7 +91,7 @@ class SafetyFilterError(GeminiAPIError):
         self.details.update({"safety_ratings": self.safety_ratings, "blocked_category": self.blocked_category})
 
 
-class EmptyResponseError(GeminiAPIError):
+class EmptyResponseError(TransientGeminiError):
     """APIからの応答が空、またはcandidatesが含まれていない場合のエラー
 
     Gemini APIから有効なcandidatesが返されない場合に発生します。
@@ -95,7 +115,7 @@ class EmptyResponseError(GeminiAPIError):
         super().__init__(message, response, **kwargs)
 
 
-class InvalidJSONError(GeminiAPIError):
+class InvalidJSONError(PermanentGeminiError):
     """APIからの応答がJSON形式として無効、または期待する構造でない場合のエラー
 
     generate_initなどでJSON形式のレスポンスを期待している場合に、
@@ -133,7 +153,7 @@ class InvalidJSONError(GeminiAPIError):
         )
 
 
-class MaxTokensError(GeminiAPIError):
+class MaxTokensError(PermanentGeminiError):
     """最大トークン数に達したことによるエラー
 
     生成中に最大トークン数制限に達した場合に発生します。
@@ -155,7 +175,7 @@ class MaxTokensError(GeminiAPIError):
             self.details["tokens_used"] = tokens_used
 
 
-class RecitationError(GeminiAPIError):
+class RecitationError(PermanentGeminiError):
     """著作権のある内容の再現が検出された場合のエラー
 
     生成されたコンテンツが既存の著作物の再現と判定された場合に発生します。
@@ -171,7 +191,7 @@ class RecitationError(GeminiAPIError):
         super().__init__(message, **kwargs)
 
 
-class NetworkError(GeminiAPIError):
+class NetworkError(TransientGeminiError):
     """ネットワーク関連のエラー
 
     APIへの接続に失敗した場合や、ネットワーク通信中に問題が発生した場合のエラーです。
@@ -197,7 +217,7 @@ class NetworkError(GeminiAPIError):
             self.details["original_error"] = str(original_error)
 
 
-class TimeoutError(GeminiAPIError):
+class TimeoutError(TransientGeminiError):
     """APIリクエストのタイムアウトエラー
 
     指定されたタイムアウト時間内にAPIからの応答が得られなかった場合に発生します。
@@ -218,7 +238,7 @@ class TimeoutError(GeminiAPIError):
             self.details["timeout_seconds"] = timeout_seconds
 
 
-class RateLimitError(GeminiAPIError):
+class RateLimitError(TransientGeminiError):
     """APIレート制限エラー
 
     APIのレート制限に達した場合に発生します。
@@ -240,7 +260,7 @@ class RateLimitError(GeminiAPIError):
             self.details["retry_after"] = retry_after
 
 
-class UnexpectedFinishReasonError(GeminiAPIError):
+class UnexpectedFinishReasonError(TransientGeminiError):
     """予期しないfinish_reasonが返された場合のエラー
 
     finish_reasonが既知のカテゴリに該当しない場合に発生します。
@@ -255,7 +275,7 @@ class UnexpectedFinishReasonError(GeminiAPIError):
         super().__init__(message, **kwargs)
 
 
-class APIAuthenticationError(GeminiAPIError):
+class APIAuthenticationError(PermanentGeminiError):
     """API認証エラー
 
     APIキーが無効、期限切れ、または権限が不足している場合に発生します。
@@ -271,6 +291,7 @@ class APIAuthenticationError(GeminiAPIError):
 
 
 # エラー種別の判定に使用する定数
+FINISH_REASON_UNSPECIFIED = "FINISH_REASON_UNSPECIFIED"  # ストリーミングの途中の断片
 FINISH_REASON_STOP = "STOP"
 FINISH_REASON_MAX_TOKENS = "MAX_TOKENS"
 FINISH_REASON_SAFETY = "SAFETY"
@@ -278,3 +299,41 @@ FINISH_REASON_RECITATION = "RECITATION"
 FINISH_REASON_OTHER = "OTHER"
 FINISH_REASON_BLOCKLIST = "BLOCKLIST"
 FINISH_REASON_PROHIBITED_CONTENT = "PROHIBITED_CONTENT"
+
+# finish_reason -> 対応する例外クラス（該当しないfinish_reasonはUnexpectedFinishReasonError）
+FINISH_REASON_TO_EXCEPTION = {
+    FINISH_REASON_MAX_TOKENS: MaxTokensError,
+    FINISH_REASON_SAFETY: SafetyFilterError,
+    FINISH_REASON_RECITATION: RecitationError,
+    FINISH_REASON_BLOCKLIST: SafetyFilterError,
+    FINISH_REASON_PROHIBITED_CONTENT: SafetyFilterError,
+}
+
+
+def raise_for_finish_reason(
+    finish_reason: str, response: Optional[Any] = None, message: Optional[str] = None, **kwargs
+):
+    """finish_reasonに対応する例外を投げる
+
+    FINISH_REASON_TO_EXCEPTION を引いて例外クラスを決めます。
+    該当しないfinish_reasonの場合はUnexpectedFinishReasonErrorを投げます。
+
+    Args:
+        finish_reason: Gemini APIのfinish_reason
+        response: Gemini APIからのレスポンスオブジェクト
+        message: エラーメッセージ（Noneの場合は各例外クラスの既定のメッセージ）
+        **kwargs: 例外クラスに渡す追加の引数（safety_ratings, tokens_used など）
+
+    Raises:
+        GeminiAPIError: finish_reasonに対応する例外
+
+    Example:
+        >>> raise_for_finish_reason("MAX_TOKENS", response, tokens_used=8192)
+        Traceback (most recent call last):
+        ...
+        MaxTokensError: Maximum token limit reached (finish_reason: MAX_TOKENS) | Details: {'tokens_used': 8192}
+    """
+    error_class = FINISH_REASON_TO_EXCEPTION.get(finish_reason, UnexpectedFinishReasonError)
+    if message is not None:
+        kwargs["message"] = message
+    raise error_class(response=response, finish_reason=finish_reason, **kwargs)
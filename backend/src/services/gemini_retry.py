@@ -8,20 +8,13 @@ import logging
 import random
 import time
 from functools import wraps
-from typing import Callable, Tuple, Type
+from typing import Callable, Optional, Tuple, Type
 
 from src.services.gemini_exceptions import (
-    APIAuthenticationError,
-    EmptyResponseError,
     GeminiAPIError,
     InvalidJSONError,
-    MaxTokensError,
-    NetworkError,
-    RateLimitError,
-    RecitationError,
-    SafetyFilterError,
-    TimeoutError,
-    UnexpectedFinishReasonError,
+    PermanentGeminiError,
+    TransientGeminiError,
 )
 
 # ロガーの設定
@@ -29,23 +22,77 @@ logger = logging.getLogger(__name__)
 
 # リトライ対象のエラー（一時的なエラー）
 # これらのエラーは再試行で成功する可能性がある
-RETRIABLE_ERRORS: Tuple[Type[Exception], ...] = (
-    NetworkError,
-    TimeoutError,
-    RateLimitError,
-    EmptyResponseError,  # API側の一時的な問題の可能性
-    UnexpectedFinishReasonError,  # 予期しないfinish_reasonも一時的な可能性
-)
+# NetworkError, TimeoutError, RateLimitError, EmptyResponseError, UnexpectedFinishReasonError が該当する
+RETRIABLE_ERRORS: Tuple[Type[Exception], ...] = (TransientGeminiError,)
 
 # リトライ対象外のエラー（構造的な問題）
 # これらのエラーは再試行しても成功しない
-NON_RETRIABLE_ERRORS: Tuple[Type[Exception], ...] = (
-    SafetyFilterError,  # プロンプトの内容に問題がある
-    MaxTokensError,  # トークン制限の問題
-    RecitationError,  # 著作権問題
-    InvalidJSONError,  # JSON構造の問題（ただしGeminiの出力ミスの可能性もあるため要注意）
-    APIAuthenticationError,  # 認証問題
-)
+# SafetyFilterError, MaxTokensError, RecitationError, InvalidJSONError, APIAuthenticationError が該当する
+NON_RETRIABLE_ERRORS: Tuple[Type[Exception], ...] = (PermanentGeminiError,)
+
+# JSON生成用のリトライ対象のエラー（Geminiの出力ミスの可能性があるためInvalidJSONErrorも含める）
+JSON_RETRIABLE_ERRORS: Tuple[Type[Exception], ...] = RETRIABLE_ERRORS + (InvalidJSONError,)
+
+
+def _next_delay(
+    attempt: int, prev_delay: float, initial_delay: float, backoff_factor: float, max_delay: float, jitter: bool
+) -> float:
+    """次のリトライまでのバックオフ時間を求める
+
+    jitter が有効な場合は decorrelated jitter（前回の待機時間の3倍までの範囲からランダムに選ぶ）を使用します。
+    同時に失敗した複数のワーカーの待機時間がばらけるため、レート制限の解除直後にリクエストが集中しにくくなります。
+    無効な場合は initial_delay * backoff_factor ** attempt の指数バックオフです。
+
+    Args:
+        attempt: 試行回数（0始まり）
+        prev_delay: 前回の待機時間（秒）。初回は initial_delay
+        initial_delay: 初期待機時間（秒）
+        backoff_factor: バックオフ係数（jitter が無効な場合のみ使用）
+        max_delay: 最大待機時間（秒）
+        jitter: ジッター（ランダムな遅延）を使用するか
+
+    Returns:
+        float: 待機時間（秒）
+    """
+    if jitter:
+        return min(max_delay, random.uniform(initial_delay, prev_delay * 3))
+    return min(max_delay, calculate_retry_delay(attempt, initial_delay, backoff_factor))
+
+
+def _calc_wait_time(
+    func_name: str, error: Exception, attempt: int, max_attempts: int, delay: float, max_delay: float
+) -> float:
+    """リトライまでの待機時間を求めてログに記録する
+
+    Args:
+        func_name: リトライする関数名（ログ用）
+        error: 発生したエラー
+        attempt: 試行回数（0始まり）
+        max_attempts: 最大試行回数（ログ用）
+        delay: バックオフによる待機時間（秒）
+        max_delay: 最大待機時間（秒）
+
+    Returns:
+        float: 待機時間（秒）
+    """
+    # RateLimitErrorの場合はretry_afterを使用（他のエラーは属性を持たないためNone）
+    retry_after = getattr(error, "retry_after", None)
+    if retry_after:
+        wait_time = min(retry_after, max_delay)
+        logger.warning("Rate limit hit for '%s'. Waiting %ss (from retry_after header)", func_name, wait_time)
+        return wait_time
+
+    wait_time = delay
+    logger.warning(
+        "Retriable error in '%s' (attempt %d/%d): %s: %s. Retrying in %.2fs...",
+        func_name,
+        attempt + 1,
+        max_attempts,
+        type(error).__name__,
+        error,
+        wait_time,
+    )
+    return wait_time
 
 
 def retry_on_error(
@@ -55,6 +102,7 @@ def retry_on_error(
     max_delay: float = 60.0,
     retriable_errors: Tuple[Type[Exception], ...] = RETRIABLE_ERRORS,
     jitter: bool = True,
+    feedback_kwarg: Optional[str] = None,
 ):
     """指数バックオフを使用したリトライデコレータ
 
@@ -63,17 +111,19 @@ def retry_on_error(
     Args:
         max_retries: 最大リトライ回数（デフォルト: 3回）
         initial_delay: 最初のリトライまでの待機時間（秒）（デフォルト: 2秒）
-        backoff_factor: 待機時間の増加率（デフォルト: 2.0倍）
+        backoff_factor: 待機時間の増加率（jitter=False の場合のみ使用）（デフォルト: 2.0倍）
         max_delay: 最大待機時間（秒）（デフォルト: 60秒）
         retriable_errors: リトライ対象のエラータプル
-        jitter: ジッター（ランダムな遅延）を追加するか（デフォルト: True）
+        jitter: decorrelated jitter で待機時間をランダムにするか（デフォルト: True）
+        feedback_kwarg: 指定した場合、InvalidJSONErrorでリトライする際にエラーメッセージを
+            このキーワード引数で次の試行に渡す（前回の誤りをプロンプトに含めて修正させるため）
 
     小説生成用のデフォルト設定:
         - max_retries=3: 合計4回の試行（初回+3回のリトライ）
-        - initial_delay=2.0: 最初は2秒待機（小説生成は時間がかかるため短め）
-        - backoff_factor=2.0: 2秒 → 4秒 → 8秒と倍増
+        - initial_delay=2.0: 2秒以上待機（小説生成は時間がかかるため短め）
+        - backoff_factor=2.0: jitter=False の場合は 2秒 → 4秒 → 8秒と倍増
         - max_delay=60.0: 最大60秒待機（長時間の生成処理に対応）
-        - jitter=True: 複数リクエストの衝突を避けるため
+        - jitter=True: 複数リクエストの衝突を避けるため（前回の待機時間の3倍までの範囲からランダムに選ぶ）
 
     Example:
         >>> @retry_on_error(max_retries=3, initial_delay=2.0)
@@ -89,19 +139,23 @@ def retry_on_error(
     """
 
     def decorator(func: Callable) -> Callable:
+        # 呼び出しごとに変わらない値はデコレート時に一度だけ求める
+        func_name = func.__name__
+        max_attempts = max_retries + 1
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             last_exception = None
             delay = initial_delay
 
-            for attempt in range(max_retries + 1):  # +1 for initial attempt
+            for attempt in range(max_attempts):  # 初回の試行 + リトライ回数
                 try:
                     # 関数を実行
                     result = func(*args, **kwargs)
 
                     # 成功した場合
                     if attempt > 0:
-                        logger.info(f"Function '{func.__name__}' succeeded on attempt {attempt + 1}/{max_retries + 1}")
+                        logger.info("Function '%s' succeeded on attempt %d/%d", func_name, attempt + 1, max_attempts)
                     return result
 
                 except retriable_errors as e:
@@ -109,47 +163,37 @@ def retry_on_error(
 
                     # 最後の試行の場合はリトライしない
                     if attempt >= max_retries:
-                        logger.error(f"Function '{func.__name__}' failed after {max_retries + 1} attempts: {e}")
+                        logger.error("Function '%s' failed after %d attempts: %s", func_name, max_attempts, e)
                         raise
 
-                    # RateLimitErrorの場合はretry_afterを使用
-                    if isinstance(e, RateLimitError) and hasattr(e, "retry_after") and e.retry_after:
-                        wait_time = min(e.retry_after, max_delay)
-                        logger.warning(
-                            f"Rate limit hit for '{func.__name__}'. Waiting {wait_time}s (from retry_after header)"
-                        )
-                    else:
-                        # 指数バックオフの計算
-                        wait_time = min(delay, max_delay)
-
-                        # ジッターを追加（衝突回避）
-                        if jitter:
-                            wait_time = wait_time * (0.5 + random.random())
-
-                        logger.warning(
-                            f"Retriable error in '{func.__name__}' (attempt {attempt + 1}/{max_retries + 1}): "
-                            f"{type(e).__name__}: {e}. Retrying in {wait_time:.2f}s..."
-                        )
+                    # 検証エラーの内容を次の試行に渡す
+                    if feedback_kwarg and isinstance(e, InvalidJSONError):
+                        kwargs[feedback_kwarg] = e.message
 
                     # 待機
-                    time.sleep(wait_time)
-
-                    # 次回の待機時間を計算
-                    delay *= backoff_factor
+                    delay = _next_delay(attempt, delay, initial_delay, backoff_factor, max_delay, jitter)
+                    time.sleep(_calc_wait_time(func_name, e, attempt, max_attempts, delay, max_delay))
 
                 except NON_RETRIABLE_ERRORS as e:
                     # リトライ対象外のエラーはそのまま投げる
-                    logger.error(f"Non-retriable error in '{func.__name__}': {type(e).__name__}: {e}")
+                    logger.error("Non-retriable error in '%s': %s: %s", func_name, type(e).__name__, e)
                     raise
 
                 except GeminiAPIError as e:
                     # その他のGeminiAPIErrorも基本的にリトライしない
-                    logger.error(f"GeminiAPIError in '{func.__name__}': {type(e).__name__}: {e}")
+                    logger.error("GeminiAPIError in '%s': %s: %s", func_name, type(e).__name__, e)
                     raise
 
                 except Exception as e:
                     # 予期しない例外はログに記録して投げる
-                    logger.error(f"Unexpected error in '{func.__name__}': {type(e).__name__}: {e}", exc_info=True)
+                    # トレースバックの整形は重いため、DEBUGレベルが有効な場合のみ出力する
+                    logger.error(
+                        "Unexpected error in '%s': %s: %s",
+                        func_name,
+                        type(e).__name__,
+                        e,
+                        exc_info=logger.isEnabledFor(logging.DEBUG),
+                    )
                     raise
 
             # ここには到達しないはずだが、念のため
@@ -168,7 +212,7 @@ def retry_for_novel_generation(func: Callable) -> Callable:
     小説生成に最適化されたリトライ設定を適用します。
     - 最大3回リトライ（合計4回の試行）
     - 初期待機時間: 2秒
-    - バックオフ係数: 2.0倍
+    - バックオフ: decorrelated jitter（前回の待機時間の3倍までの範囲からランダム）
     - 最大待機時間: 60秒
 
     Example:
@@ -186,7 +230,7 @@ def retry_for_quick_request(func: Callable) -> Callable:
     短時間のリクエスト（メタデータ取得など）に最適化されたリトライ設定です。
     - 最大2回リトライ（合計3回の試行）
     - 初期待機時間: 1秒
-    - バックオフ係数: 1.5倍
+    - バックオフ: decorrelated jitter（前回の待機時間の3倍までの範囲からランダム）
     - 最大待機時間: 10秒
 
     Example:
@@ -203,26 +247,25 @@ def retry_for_json_generation(func: Callable) -> Callable:
 
     JSON形式の生成に最適化されたリトライ設定です。
     InvalidJSONErrorもリトライ対象に含めます（Geminiの出力ミスの可能性があるため）。
+    その場合、検証エラーのメッセージを feedback キーワード引数で次の試行に渡します。
     - 最大4回リトライ（合計5回の試行）
     - 初期待機時間: 2秒
-    - バックオフ係数: 1.8倍
+    - バックオフ: decorrelated jitter（前回の待機時間の3倍までの範囲からランダム）
     - 最大待機時間: 45秒
 
     Example:
         >>> @retry_for_json_generation
-        ... def generate_init_json(text_length, chapter_count, other):
+        ... def generate_init_json(text_length, chapter_count, other, feedback=None):
         ...     return model.generate_content(...)
     """
-    # InvalidJSONErrorをリトライ対象に追加
-    extended_retriable = RETRIABLE_ERRORS + (InvalidJSONError,)
-
     return retry_on_error(
         max_retries=4,
         initial_delay=2.0,
         backoff_factor=1.8,
         max_delay=45.0,
-        retriable_errors=extended_retriable,
+        retriable_errors=JSON_RETRIABLE_ERRORS,
         jitter=True,
+        feedback_kwarg="feedback",
     )(func)
 
 
@@ -4,31 +4,60 @@ Gemini APIから返されるレスポンスを検証し、エラーを適切に
 ヘルパー関数を提供します。
 """
 
+import enum
 import json
 import logging
-from typing import Any, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
 
 from src.services.gemini_exceptions import (
     FINISH_REASON_BLOCKLIST,
     FINISH_REASON_MAX_TOKENS,
-    FINISH_REASON_OTHER,
     FINISH_REASON_PROHIBITED_CONTENT,
     FINISH_REASON_RECITATION,
     FINISH_REASON_SAFETY,
     FINISH_REASON_STOP,
+    FINISH_REASON_UNSPECIFIED,
     EmptyResponseError,
     InvalidJSONError,
-    MaxTokensError,
-    RecitationError,
-    SafetyFilterError,
-    UnexpectedFinishReasonError,
+    raise_for_finish_reason,
 )
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# 属性が存在しないことを表す番兵（Noneが有効な値となる属性に使用する）
+_MISSING = object()
+
+# enumの値から名前へのキャッシュ（IntEnumは同じ値の整数と等しくなるため、型も含めてキーにする）
+_ENUM_NAMES: Dict[Tuple[type, Any], str] = {}
+# 最初に受け取ったSTOPのfinish_reason（enum）。以降は同一性の比較のみで正常終了と判定する
+_stop_reason: Any = object()
+
+
+def _name(value: Any) -> str:
+    """enumの値の名前を返す（enum以外の値は文字列に変換する）
+
+    finish_reasonやsafety_ratingsのcategory・probabilityはenumのため、
+    一度求めた名前をキャッシュして以降の呼び出しでは辞書の参照のみで返します。
 
-def validate_response(response: Any, context: str = "") -> None:
+    Args:
+        value: enumの値または任意の値
+
+    Returns:
+        str: enumの名前、またはstr(value)
+    """
+    key = (type(value), value)
+    name = _ENUM_NAMES.get(key)
+    if name is None:
+        name = getattr(value, "name", None) or str(value)
+        if isinstance(value, enum.Enum):
+            _ENUM_NAMES[key] = name
+    return name
+
+
+def validate_response(response: Any, context: str = "") -> Any:
     """Gemini APIレスポンスの包括的な検証を行う
 
     レスポンスが有効かどうかを確認し、問題があれば適切な例外を投げます。
@@ -37,6 +66,9 @@ def validate_response(response: Any, context: str = "") -> None:
         response: Gemini APIから返されたレスポンスオブジェクト
         context: エラーメッセージに含めるコンテキスト情報（例: "generate_plot"）
 
+    Returns:
+        Any: 検証済みの最初のcandidate
+
     Raises:
         EmptyResponseError: candidatesが空またはpartsがない場合
         SafetyFilterError: 安全性フィルターでブロックされた場合
@@ -48,29 +80,38 @@ def validate_response(response: Any, context: str = "") -> None:
         >>> response = model.generate_content("...")
         >>> validate_response(response, context="generate_plot")
     """
+    global _stop_reason
     context_msg = f" [{context}]" if context else ""
 
     # 1. candidatesの存在確認
-    if not hasattr(response, "candidates") or not response.candidates:
+    candidates = getattr(response, "candidates", None)
+    if not candidates:
         logger.error(f"Empty candidates in response{context_msg}")
         raise EmptyResponseError(message=f"API response contains no candidates{context_msg}", response=response)
 
     # 最初のcandidateを取得
-    candidate = response.candidates[0]
+    candidate = candidates[0]
 
     # 2. finish_reasonの確認
     finish_reason = None
-    if hasattr(candidate, "finish_reason"):
+    reason = getattr(candidate, "finish_reason", _MISSING)
+    if reason is _stop_reason:
+        finish_reason = FINISH_REASON_STOP
+    elif reason is not _MISSING:
         # finish_reasonはenumの可能性があるため、name属性または文字列変換を試みる
-        finish_reason = getattr(candidate.finish_reason, "name", None) or str(candidate.finish_reason)
-        logger.debug(f"Response finish_reason{context_msg}: {finish_reason}")
+        finish_reason = _name(reason)
+        if finish_reason == FINISH_REASON_STOP and isinstance(reason, enum.Enum):
+            _stop_reason = reason
+    if reason is not _MISSING:
+        logger.debug("Response finish_reason%s: %s", context_msg, finish_reason)
 
     # 3. content.partsの存在確認
-    if not hasattr(candidate, "content") or not candidate.content:
+    content = getattr(candidate, "content", None)
+    if not content:
         logger.error(f"No content in candidate{context_msg}")
         _handle_finish_reason_error(finish_reason, response, candidate, context_msg)
 
-    if not hasattr(candidate.content, "parts") or not candidate.content.parts:
+    if not getattr(content, "parts", None):
         logger.error(f"No parts in candidate content{context_msg}")
         _handle_finish_reason_error(finish_reason, response, candidate, context_msg)
 
@@ -78,7 +119,72 @@ def validate_response(response: Any, context: str = "") -> None:
     if finish_reason and finish_reason != FINISH_REASON_STOP:
         _handle_finish_reason_error(finish_reason, response, candidate, context_msg)
 
-    logger.debug(f"Response validation passed{context_msg}")
+    logger.debug("Response validation passed%s", context_msg)
+    return candidate
+
+
+def _extract_safety_ratings(candidate: Any) -> Tuple[list, Optional[str]]:
+    """candidateのsafety_ratingsを辞書のリストに変換し、ブロックされたカテゴリを特定する
+
+    Args:
+        candidate: candidateオブジェクト
+
+    Returns:
+        Tuple[list, Optional[str]]: (safety_ratingsのリスト, 最初にブロックされたカテゴリ)
+    """
+    safety_ratings = []
+    blocked_category = None
+    for rating in getattr(candidate, "safety_ratings", None) or ():
+        blocked = getattr(rating, "blocked", False)
+        category_name = _name(rating.category)
+        safety_ratings.append({"category": category_name, "probability": _name(rating.probability), "blocked": blocked})
+        # 最初にブロックされたカテゴリを記録する
+        if blocked and blocked_category is None:
+            blocked_category = category_name
+    return safety_ratings, blocked_category
+
+
+def _safety_details(response: Any, candidate: Any, context_msg: str) -> dict:
+    """安全性フィルターでブロックされた場合の例外の引数"""
+    safety_ratings, blocked_category = _extract_safety_ratings(candidate)
+    return {
+        "message": f"Content blocked by safety filter{context_msg}",
+        "safety_ratings": safety_ratings,
+        "blocked_category": blocked_category,
+    }
+
+
+def _max_tokens_details(response: Any, candidate: Any, context_msg: str) -> dict:
+    """トークン数制限に達した場合の例外の引数"""
+    return {
+        "message": f"Maximum token limit reached{context_msg}",
+        "tokens_used": getattr(getattr(response, "usage_metadata", None), "total_token_count", None),
+    }
+
+
+def _recitation_details(response: Any, candidate: Any, context_msg: str) -> dict:
+    """著作権問題で停止した場合の例外の引数"""
+    return {"message": f"Content flagged for recitation{context_msg}"}
+
+
+def _prohibited_details(response: Any, candidate: Any, context_msg: str) -> dict:
+    """禁止コンテンツまたはブロックリストで停止した場合の例外の引数"""
+    safety_ratings, _ = _extract_safety_ratings(candidate)
+    return {
+        "message": f"Content blocked due to prohibited content or blocklist{context_msg}",
+        "safety_ratings": safety_ratings,
+    }
+
+
+# finish_reasonごとの例外の引数を組み立てる関数（例外クラスは FINISH_REASON_TO_EXCEPTION で決まる）
+# safety_ratingsは必要な関数のみが取得する
+_FINISH_REASON_DETAILS: Dict[str, Callable[[Any, Any, str], dict]] = {
+    FINISH_REASON_SAFETY: _safety_details,
+    FINISH_REASON_MAX_TOKENS: _max_tokens_details,
+    FINISH_REASON_RECITATION: _recitation_details,
+    FINISH_REASON_BLOCKLIST: _prohibited_details,
+    FINISH_REASON_PROHIBITED_CONTENT: _prohibited_details,
+}
 
 
 def _handle_finish_reason_error(finish_reason: Optional[str], response: Any, candidate: Any, context_msg: str) -> None:
@@ -93,64 +199,13 @@ def _handle_finish_reason_error(finish_reason: Optional[str], response: Any, can
     Raises:
         適切なカスタム例外
     """
-    # safety_ratingsの取得
-    safety_ratings = []
-    blocked_category = None
-    if hasattr(candidate, "safety_ratings") and candidate.safety_ratings:
-        safety_ratings = [
-            {
-                "category": getattr(rating.category, "name", str(rating.category)),
-                "probability": getattr(rating.probability, "name", str(rating.probability)),
-                "blocked": getattr(rating, "blocked", False),
-            }
-            for rating in candidate.safety_ratings
-        ]
-        # ブロックされたカテゴリを特定
-        for rating in candidate.safety_ratings:
-            if getattr(rating, "blocked", False):
-                blocked_category = getattr(rating.category, "name", str(rating.category))
-                break
-
-    # finish_reasonに応じた例外を投げる
-    if finish_reason == FINISH_REASON_SAFETY:
-        raise SafetyFilterError(
-            message=f"Content blocked by safety filter{context_msg}",
-            response=response,
-            finish_reason=finish_reason,
-            safety_ratings=safety_ratings,
-            blocked_category=blocked_category,
-        )
-
-    elif finish_reason == FINISH_REASON_MAX_TOKENS:
-        tokens_used = None
-        if hasattr(response, "usage_metadata") and hasattr(response.usage_metadata, "total_token_count"):
-            tokens_used = response.usage_metadata.total_token_count
-        raise MaxTokensError(
-            message=f"Maximum token limit reached{context_msg}",
-            response=response,
-            finish_reason=finish_reason,
-            tokens_used=tokens_used,
-        )
-
-    elif finish_reason == FINISH_REASON_RECITATION:
-        raise RecitationError(
-            message=f"Content flagged for recitation{context_msg}", response=response, finish_reason=finish_reason
-        )
-
-    elif finish_reason in [FINISH_REASON_BLOCKLIST, FINISH_REASON_PROHIBITED_CONTENT]:
-        raise SafetyFilterError(
-            message=f"Content blocked due to prohibited content or blocklist{context_msg}",
-            response=response,
-            finish_reason=finish_reason,
-            safety_ratings=safety_ratings,
-        )
-
-    elif finish_reason == FINISH_REASON_OTHER or finish_reason:
-        # その他の予期しないfinish_reason
-        raise UnexpectedFinishReasonError(
-            message=f"Unexpected finish_reason: {finish_reason}{context_msg}",
-            response=response,
-            finish_reason=finish_reason,
+    if finish_reason:
+        # finish_reasonに応じた例外を投げる（OTHERを含むその他のfinish_reasonはUnexpectedFinishReasonError）
+        details = _FINISH_REASON_DETAILS.get(finish_reason)
+        if details is not None:
+            raise_for_finish_reason(finish_reason, response, **details(response, candidate, context_msg))
+        raise_for_finish_reason(
+            finish_reason, response, message=f"Unexpected finish_reason: {finish_reason}{context_msg}"
         )
 
     # finish_reasonがないがエラーが発生している場合
@@ -191,6 +246,38 @@ def get_safe_text(response: Any, context: str = "") -> str:
         )
 
 
+def get_safe_chunk_text(chunk: Any, context: str = "") -> str:
+    """ストリーミングレスポンスの断片から安全にテキストを取得する
+
+    途中の断片はfinish_reasonが未確定のため、未確定またはSTOPの断片は正常として扱い、
+    本文を含まない断片（終了通知のみの断片など）は空文字列を返します。
+    それ以外の断片はget_safe_text()で検証し、問題があれば例外を投げます。
+
+    Args:
+        chunk: generate_content(stream=True)のレスポンスから取り出した断片
+        context: エラーメッセージに含めるコンテキスト情報
+
+    Returns:
+        str: 断片に含まれるテキスト
+
+    Raises:
+        各種GeminiAPIError: 断片に問題がある場合
+
+    Example:
+        >>> for chunk in model.generate_content("...", stream=True):
+        ...     text = get_safe_chunk_text(chunk, context="generate_chapter")
+    """
+    if getattr(chunk, "candidates", None):
+        candidate = chunk.candidates[0]
+        reason = getattr(candidate, "finish_reason", None)
+        finish_reason = _name(reason) if reason else None
+        if finish_reason in (None, FINISH_REASON_UNSPECIFIED, FINISH_REASON_STOP):
+            parts = getattr(getattr(candidate, "content", None), "parts", None)
+            return "".join(getattr(part, "text", "") for part in parts) if parts else ""
+
+    return get_safe_text(chunk, context)
+
+
 def check_safety_ratings(response: Any, context: str = "") -> list:
     """レスポンスのsafety_ratingsを取得して確認する
 
@@ -212,34 +299,40 @@ def check_safety_ratings(response: Any, context: str = "") -> list:
     context_msg = f" [{context}]" if context else ""
     safety_ratings = []
 
-    if hasattr(response, "candidates") and response.candidates:
-        candidate = response.candidates[0]
-        if hasattr(candidate, "safety_ratings") and candidate.safety_ratings:
-            for rating in candidate.safety_ratings:
-                rating_dict = {
-                    "category": getattr(rating.category, "name", str(rating.category)),
-                    "probability": getattr(rating.probability, "name", str(rating.probability)),
-                    "blocked": getattr(rating, "blocked", False),
-                }
-                safety_ratings.append(rating_dict)
-
-                # ログ出力
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    candidates = getattr(response, "candidates", None)
+    if candidates:
+        for rating in getattr(candidates[0], "safety_ratings", None) or ():
+            category = rating.category
+            probability = rating.probability
+            rating_dict = {
+                "category": _name(category),
+                "probability": _name(probability),
+                "blocked": getattr(rating, "blocked", False),
+            }
+            safety_ratings.append(rating_dict)
+
+            # ログ出力
+            if debug_enabled:
                 logger.debug(
-                    f"Safety rating{context_msg}: "
-                    f"{rating_dict['category']} = {rating_dict['probability']} "
-                    f"(blocked: {rating_dict['blocked']})"
+                    "Safety rating%s: %s = %s (blocked: %s)",
+                    context_msg,
+                    rating_dict["category"],
+                    rating_dict["probability"],
+                    rating_dict["blocked"],
                 )
 
     return safety_ratings
 
 
-def get_response_metadata(response: Any) -> dict:
+def get_response_metadata(response: Any, include_safety_ratings: bool = True) -> dict:
     """レスポンスからメタデータを抽出する
 
     ロギングやデバッグ用にレスポンスの詳細情報を取得します。
 
     Args:
         response: Gemini APIから返されたレスポンスオブジェクト
+        include_safety_ratings: Falseの場合、safety_ratingsを取得しない（トークン数のみが必要な場合）
 
     Returns:
         dict: メタデータの辞書
@@ -252,20 +345,22 @@ def get_response_metadata(response: Any) -> dict:
     metadata = {}
 
     # finish_reasonの取得
-    if hasattr(response, "candidates") and response.candidates:
-        candidate = response.candidates[0]
-        if hasattr(candidate, "finish_reason"):
-            metadata["finish_reason"] = getattr(candidate.finish_reason, "name", str(candidate.finish_reason))
+    candidates = getattr(response, "candidates", None)
+    if candidates:
+        reason = getattr(candidates[0], "finish_reason", _MISSING)
+        if reason is not _MISSING:
+            metadata["finish_reason"] = _name(reason)
 
     # usage_metadataの取得
-    if hasattr(response, "usage_metadata"):
-        usage = response.usage_metadata
+    usage = getattr(response, "usage_metadata", _MISSING)
+    if usage is not _MISSING:
         metadata["prompt_token_count"] = getattr(usage, "prompt_token_count", None)
         metadata["candidates_token_count"] = getattr(usage, "candidates_token_count", None)
         metadata["total_token_count"] = getattr(usage, "total_token_count", None)
 
     # safety_ratingsの取得
-    metadata["safety_ratings"] = check_safety_ratings(response)
+    if include_safety_ratings:
+        metadata["safety_ratings"] = check_safety_ratings(response)
 
     return metadata
 
@@ -297,6 +392,9 @@ NOVEL_INIT_SCHEMA = {
     },
 }
 
+# LLMの出力から埋め込まれたJSONを解析するデコーダ（文字列中の生の改行などを許容する）
+_lenient_json_decoder = json.JSONDecoder(strict=False)
+
 
 def validate_json_response(json_text: str, schema: dict = None, context: str = "validate_json") -> dict:
     """Gemini APIから返されたJSON文字列を検証してパースする
@@ -326,8 +424,8 @@ def validate_json_response(json_text: str, schema: dict = None, context: str = "
 
     # 1. JSON文字列の解析
     try:
-        data = json.loads(json_text)
-    except json.JSONDecodeError as e:
+        data = orjson.loads(json_text)
+    except orjson.JSONDecodeError as e:
         logger.error(f"JSON parse error{context_msg}: {e}")
         raise InvalidJSONError(
             message=f"Failed to parse JSON{context_msg}",
@@ -335,125 +433,191 @@ def validate_json_response(json_text: str, schema: dict = None, context: str = "
             parse_error=str(e),
         )
 
-    # 2. 型チェック（辞書であることを確認）
+    return _validate_json_object(data, schema, context_msg, raw_text=json_text)
+
+
+def _validate_json_object(data: Any, schema: dict, context_msg: str, raw_text: str) -> dict:
+    """パース済みのJSONが辞書であり、スキーマに従っていることを検証する
+
+    Args:
+        data: パース済みのJSON
+        schema: 検証に使用するスキーマ定義
+        context_msg: エラーメッセージに含めるコンテキスト情報
+        raw_text: エラーに含める元のテキスト
+
+    Returns:
+        dict: 検証済みのJSON辞書
+
+    Raises:
+        InvalidJSONError: 構造が不正な場合
+    """
+    # 型チェック（辞書であることを確認）
     if not isinstance(data, dict):
         logger.error(f"JSON is not a dictionary{context_msg}")
         raise InvalidJSONError(
             message=f"Expected JSON object (dict), got {type(data).__name__}{context_msg}",
-            raw_text=json_text,
+            raw_text=raw_text,
         )
 
-    # 3. スキーマに基づく検証
+    # スキーマに基づく検証
     try:
-        _validate_schema(data, schema, context_msg)
+        _get_schema_validator(schema)(data, context_msg)
     except InvalidJSONError:
         raise
     except Exception as e:
         logger.error(f"Unexpected error during schema validation{context_msg}: {e}")
         raise InvalidJSONError(
             message=f"Schema validation failed{context_msg}: {str(e)}",
-            raw_text=json_text,
+            raw_text=raw_text,
         )
 
-    logger.debug(f"JSON validation passed{context_msg}")
+    logger.debug("JSON validation passed%s", context_msg)
     return data
 
 
-def _validate_schema(data: dict, schema: dict, context_msg: str) -> None:
-    """スキーマに基づいてデータ構造を検証する
+# スキーマの型名と対応するPythonの型・エラーメッセージでの表記
+# （JSONパーサーはサブクラスを返さないため、検証では type(value) is python_type で比較する）
+_SCHEMA_TYPES = {"str": (str, "string"), "list": (list, "list"), "dict": (dict, "dict")}
+
+# コンパイル済みのスキーマ検証関数: id(スキーマ) -> (スキーマ, 検証関数)
+_SCHEMA_VALIDATORS: Dict[int, Tuple[dict, Callable[[dict, str], None]]] = {}
+
+
+def _get_schema_validator(schema: dict) -> Callable[[dict, str], None]:
+    """スキーマに対応するコンパイル済みの検証関数を返す
+
+    スキーマは初回の使用時にコンパイルされるため、それ以降にスキーマの辞書を変更しても反映されません。
 
     Args:
-        data: 検証対象のデータ
         schema: スキーマ定義
-        context_msg: コンテキストメッセージ
 
-    Raises:
-        InvalidJSONError: スキーマに適合しない場合
+    Returns:
+        Callable[[dict, str], None]: (データ, コンテキストメッセージ) を受け取る検証関数
     """
-    missing_keys = []
+    cached = _SCHEMA_VALIDATORS.get(id(schema))
+    if cached is None or cached[0] is not schema:
+        cached = (schema, _compile_schema(schema))
+        _SCHEMA_VALIDATORS[id(schema)] = cached
+    return cached[1]
 
-    for key, rules in schema.items():
-        # 必須キーの存在確認
-        if rules.get("required", False) and key not in data:
-            missing_keys.append(key)
-            continue
 
-        # キーが存在しない場合はスキップ（オプショナル）
-        if key not in data:
-            continue
+def _compile_schema(schema: dict) -> Callable[[dict, str], None]:
+    """スキーマ定義を検証関数にコンパイルする
 
-        value = data[key]
-        expected_type = rules.get("type")
+    各キーのルール（必須か、期待する型、リスト要素のスキーマ）をあらかじめタプルに展開しておき、
+    検証時にはスキーマの辞書を参照せずにデータのみを走査します。
 
-        # 型チェック
-        if expected_type == "str" and not isinstance(value, str):
-            raise InvalidJSONError(
-                message=f"Key '{key}' should be string, got {type(value).__name__}{context_msg}",
-                missing_keys=[key],
-            )
+    Args:
+        schema: スキーマ定義
 
-        elif expected_type == "list" and not isinstance(value, list):
-            raise InvalidJSONError(
-                message=f"Key '{key}' should be list, got {type(value).__name__}{context_msg}",
-                missing_keys=[key],
-            )
+    Returns:
+        Callable[[dict, str], None]: (データ, コンテキストメッセージ) を受け取り、
+            スキーマに適合しない場合にInvalidJSONErrorを投げる関数
+    """
+    rules = []
+    for key, rule in schema.items():
+        expected_type = rule.get("type")
+        python_type, type_label = _SCHEMA_TYPES.get(expected_type, (None, None))
+        validate_item = None
+        if expected_type == "list" and "item_schema" in rule:
+            validate_item = _compile_schema(rule["item_schema"])
+        rules.append((key, rule.get("required", False), python_type, type_label, validate_item))
+    rules = tuple(rules)
+
+    def validate(data: dict, context_msg: str, parent_key: Optional[str] = None, index: int = 0) -> None:
+        # リスト要素の検証では、エラーメッセージ用の位置情報（" in key[i]"）はエラー時にのみ組み立てる
+        missing_keys = []
+
+        for key, required, python_type, type_label, validate_item in rules:
+            # キーが存在しない場合、必須キーのみ記録する
+            if key not in data:
+                if required:
+                    missing_keys.append(key)
+                continue
+
+            value = data[key]
+
+            # 型チェック
+            if python_type is not None and type(value) is not python_type:
+                raise InvalidJSONError(
+                    message=f"Key '{key}' should be {type_label}, got {type(value).__name__}"
+                    f"{_item_context(context_msg, parent_key, index)}",
+                    missing_keys=[key],
+                )
 
-        elif expected_type == "dict" and not isinstance(value, dict):
+            # リスト内の要素の検証
+            if validate_item is not None:
+                item_context = _item_context(context_msg, parent_key, index)
+                for i, item in enumerate(value):
+                    if type(item) is not dict:
+                        raise InvalidJSONError(
+                            message=f"Key '{key}[{i}]' should be dict, got {type(item).__name__}{item_context}",
+                            missing_keys=[f"{key}[{i}]"],
+                        )
+                    try:
+                        validate_item(item, item_context, key, i)
+                    except InvalidJSONError as e:
+                        # リストアイテムのエラーに親キー情報を追加
+                        raise InvalidJSONError(
+                            message=e.message,
+                            missing_keys=[f"{key}[{i}].{mk}" for mk in (e.missing_keys or [])],
+                        )
+
+        # 必須キーが欠けている場合
+        if missing_keys:
+            context_msg = _item_context(context_msg, parent_key, index)
+            logger.error(f"Missing required keys{context_msg}: {missing_keys}")
             raise InvalidJSONError(
-                message=f"Key '{key}' should be dict, got {type(value).__name__}{context_msg}",
-                missing_keys=[key],
+                message=f"Missing required keys{context_msg}: {', '.join(missing_keys)}",
+                missing_keys=missing_keys,
             )
 
-        # リスト内の要素の検証
-        if expected_type == "list" and "item_schema" in rules:
-            item_schema = rules["item_schema"]
-            for i, item in enumerate(value):
-                if not isinstance(item, dict):
-                    raise InvalidJSONError(
-                        message=f"Key '{key}[{i}]' should be dict, got {type(item).__name__}{context_msg}",
-                        missing_keys=[f"{key}[{i}]"],
-                    )
-                # 再帰的にアイテムスキーマを検証
-                try:
-                    _validate_schema(item, item_schema, f"{context_msg} in {key}[{i}]")
-                except InvalidJSONError as e:
-                    # リストアイテムのエラーに親キー情報を追加
-                    raise InvalidJSONError(
-                        message=e.message,
-                        missing_keys=[f"{key}[{i}].{mk}" for mk in (e.missing_keys or [])],
-                    )
-
-    # 必須キーが欠けている場合
-    if missing_keys:
-        logger.error(f"Missing required keys{context_msg}: {missing_keys}")
-        raise InvalidJSONError(
-            message=f"Missing required keys{context_msg}: {', '.join(missing_keys)}",
-            missing_keys=missing_keys,
-        )
+    return validate
+
+
+def _item_context(context_msg: str, parent_key: Optional[str], index: int) -> str:
+    """リスト要素の検証時のコンテキストメッセージを返す
+
+    Args:
+        context_msg: 親のコンテキストメッセージ
+        parent_key: 要素を含むリストのキー（トップレベルの場合はNone）
+        index: リスト内の要素の位置
+
+    Returns:
+        str: 位置情報を付加したコンテキストメッセージ
+    """
+    if parent_key is None:
+        return context_msg
+    return f"{context_msg} in {parent_key}[{index}]"
+
 
+# generate_initのスキーマはインポート時にコンパイルしておく
+_get_schema_validator(NOVEL_INIT_SCHEMA)
 
-def extract_json_from_text(text: str) -> str:
-    """テキストからJSON部分を抽出する
 
-    Gemini APIのレスポンスにはJSONの前後に余分なテキストが含まれる場合があるため、
-    JSON部分のみを抽出します。
+def decode_json_from_text(text: str, context: str = "") -> Any:
+    """テキスト中の最初のJSON値を解析する
+
+    Gemini APIのレスポンスにはJSONの前後に余分なテキスト（コードブロックの記号など）が含まれる場合があるため、
+    最初の'{'からJSONを1回だけ読み進めて解析し、その後ろのテキストは無視します。
+    文字列中の生の改行などの制御文字も許容します。
 
     Args:
         text: JSON文字列を含むテキスト
+        context: エラーメッセージに含めるコンテキスト情報
 
     Returns:
-        str: 抽出されたJSON文字列
+        Any: 解析されたJSON
 
     Raises:
-        InvalidJSONError: JSONが見つからない場合
+        InvalidJSONError: JSONが見つからない、または解析できない場合
 
     Example:
         >>> text = "Here is the data: {\"key\": \"value\"} end"
-        >>> json_str = extract_json_from_text(text)
-        >>> print(json_str)  # '{"key": "value"}'
+        >>> decode_json_from_text(text)
+        {'key': 'value'}
     """
-    # 改行を除去
-    text = text.replace("\n", "")
+    context_msg = f" [{context}]" if context else ""
 
     # JSONの開始位置を探す
     json_start = text.find("{")
@@ -464,20 +628,17 @@ def extract_json_from_text(text: str) -> str:
             raw_text=text,
         )
 
-    # JSONの終了位置を探す（最後の}）
-    json_end = text.rfind("}")
-    if json_end == -1 or json_end < json_start:
-        logger.error("No closing brace found in text")
+    # 開始位置から1つのJSON値のみを解析する（末尾の余分なテキストは読まない）
+    try:
+        data, _ = _lenient_json_decoder.raw_decode(text, json_start)
+    except json.JSONDecodeError as e:
+        logger.error(f"JSON parse error{context_msg}: {e}")
         raise InvalidJSONError(
-            message="Could not find JSON closing brace '}' in response",
+            message=f"Failed to parse JSON{context_msg}",
             raw_text=text,
+            parse_error=str(e),
         )
-
-    # JSON部分を抽出
-    json_text = text[json_start : json_end + 1]
-    logger.debug(f"Extracted JSON: {json_text[:100]}...")
-
-    return json_text
+    return data
 
 
 def validate_novel_init_json(
@@ -485,7 +646,7 @@ def validate_novel_init_json(
 ) -> dict:
     """generate_init用のJSON検証（高レベル関数）
 
-    extract_json_from_text、validate_json_response、および追加の
+    JSONの解析（orjson、失敗時はdecode_json_from_text）、スキーマ検証、および追加の
     ビジネスロジック検証を組み合わせた便利な関数です。
 
     Args:
@@ -504,14 +665,15 @@ def validate_novel_init_json(
         >>> data = validate_novel_init_json(response_text, expected_chapter_count=5)
         >>> print(data["title"])
     """
-    # 1. JSONを抽出
+    # 1. JSONを解析（JSONモードの応答はJSONのみのためorjsonで解析し、失敗した場合のみテキスト中からJSONを抽出する）
     try:
-        extracted_json = extract_json_from_text(json_text)
-    except InvalidJSONError:
-        raise
+        data = orjson.loads(json_text)
+    except orjson.JSONDecodeError:
+        data = decode_json_from_text(json_text, context=context)
 
     # 2. JSONをバリデーション
-    data = validate_json_response(extracted_json, schema=NOVEL_INIT_SCHEMA, context=context)
+    context_msg = f" [{context}]" if context else ""
+    data = _validate_json_object(data, NOVEL_INIT_SCHEMA, context_msg, raw_text=json_text)
 
     # 3. ビジネスロジックの検証（章の数）
     if expected_chapter_count is not None:
@@ -537,6 +699,77 @@ def validate_novel_init_json(
     return data
 
 
+def parse_and_validate_novel_init(
+    response: Any, expected_chapter_count: Optional[int] = None, context: str = "generate_init"
+) -> Tuple[dict, str]:
+    """generate_initのレスポンスを検証し、JSONを解析・検証する
+
+    get_safe_text()とvalidate_novel_init_json()を組み合わせた関数です。
+    validate_response()で検証したcandidateのpartsから直接テキストを組み立てるため、
+    response.textによるcandidatesとpartsの再走査を行いません。
+
+    Args:
+        response: Gemini APIから返されたレスポンスオブジェクト
+        expected_chapter_count: 期待される章の数（検証に使用）
+        context: コンテキスト情報
+
+    Returns:
+        Tuple[dict, str]: (検証済みのJSON辞書, レスポンスのテキスト)
+
+    Raises:
+        各種GeminiAPIError: レスポンスに問題がある場合
+        InvalidJSONError: JSONの検証失敗時
+
+    Example:
+        >>> response = model.generate_content(...)
+        >>> data, text = parse_and_validate_novel_init(response, expected_chapter_count=5)
+    """
+    candidate = validate_response(response, context)
+    # partsが1つの場合、joinはそのテキストをコピーせずに返す
+    text = "".join([getattr(part, "text", "") for part in candidate.content.parts])
+    return validate_novel_init_json(text, expected_chapter_count=expected_chapter_count, context=context), text
+
+
+# スキーマの型名と、Gemini APIのレスポンススキーマ（OpenAPI形式）での型名
+_RESPONSE_SCHEMA_TYPES = {"str": "string", "list": "array", "dict": "object"}
+
+
+def to_response_schema(schema: dict) -> dict:
+    """スキーマ定義をGemini APIのレスポンススキーマ（response_schema）に変換する
+
+    generation_configのresponse_schemaに指定することで、モデルにスキーマに沿ったJSONを出力させます。
+    検証用のスキーマと同じ定義から作成するため、プロンプト変更時もスキーマの定義を編集するだけで済みます。
+
+    Args:
+        schema: スキーマ定義辞書
+
+    Returns:
+        dict: OpenAPI形式のオブジェクトのスキーマ
+
+    Example:
+        >>> model.generate_content(
+        ...     prompt,
+        ...     generation_config={
+        ...         "response_mime_type": "application/json",
+        ...         "response_schema": to_response_schema(NOVEL_INIT_SCHEMA),
+        ...     },
+        ... )
+    """
+    properties = {}
+    for key, rule in schema.items():
+        prop = {"type": _RESPONSE_SCHEMA_TYPES[rule["type"]]}
+        if "description" in rule:
+            prop["description"] = rule["description"]
+        if "item_schema" in rule:
+            prop["items"] = to_response_schema(rule["item_schema"])
+        properties[key] = prop
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": [key for key, rule in schema.items() if rule.get("required", False)],
+    }
+
+
 def create_custom_schema(schema_definition: dict) -> dict:
     """カスタムスキーマを作成するヘルパー関数
 
@@ -0,0 +1,65 @@
+"""orjsonを用いたJSONシリアライズモジュール
+
+Flask本体の`app.json`とflask-restxの`application/json`レスポンスの両方で
+標準ライブラリのjsonの代わりにorjsonを使用します。
+"""
+
+from typing import Any
+
+import orjson
+from flask import current_app, make_response
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+# 文字列以外の辞書キーも許可する(標準ライブラリのjsonと同じ挙動)
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """オブジェクトをUTF-8のJSONバイト列に変換する
+
+    Args:
+        obj: 変換するオブジェクト
+        indent: Trueの場合はインデント付きで出力する
+
+    Returns:
+        bytes: JSONバイト列
+    """
+    option = ORJSON_OPTIONS | orjson.OPT_INDENT_2 if indent else ORJSON_OPTIONS
+    # orjsonが扱えない型はFlask標準のフォールバック(date, Decimal, UUID, dataclass等)に委ねる
+    return orjson.dumps(obj, default=DefaultJSONProvider.default, option=option)
+
+
+class ORJSONProvider(JSONProvider):
+    """orjsonを使用するFlaskのJSONプロバイダー
+
+    Example:
+        >>> app.json = ORJSONProvider(app)
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return _dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(_dumps_bytes(obj, indent=self._app.debug), mimetype="application/json")
+
+
+def output_json(data: Any, code: int, headers: dict | None = None):
+    """flask-restx用のorjsonによるJSONレスポンス生成関数
+
+    `flask_restx.representations.output_json`の置き換えです。
+
+    Args:
+        data: レスポンスボディ
+        code: HTTPステータスコード
+        headers: 追加のレスポンスヘッダー
+
+    Returns:
+        Response: JSONレスポンス
+    """
+    resp = make_response(_dumps_bytes(data, indent=current_app.debug) + b"\n", code)
+    resp.headers.extend(headers or {})
+    return resp
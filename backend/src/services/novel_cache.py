@@ -0,0 +1,219 @@
+"""小説データのプロセス内キャッシュモジュール
+
+ポーリング系エンドポイントがDBへ問い合わせずに応答できるように、
+バックグラウンドタスクが更新する小説ごとの生成進捗をプロセス内に保持します。
+また、起動時のシード以降は変更されないジャンル・ムードのコードと表示名の対応と、
+同一プロンプトに対するGeminiの生成結果（有効化した場合のみ。ファイルへの保存も可能）も保持します。
+
+Note:
+    キャッシュはプロセスローカルです。複数ワーカー構成では、各ワーカーは自身が起動した
+    バックグラウンドタスクの進捗のみを保持し、それ以外の小説はDB問い合わせにフォールバックします。
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import orjson
+
+from src.database import db
+from src.models import Genre, Mood
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
+
+# 生成中の小説の進捗: novel_id -> 進捗情報の辞書
+_novel_progress: Dict[str, dict] = {}
+_novel_progress_lock = threading.Lock()
+
+# ジャンル・ムードのコード -> 表示名（初回参照時にDBから読み込む）
+_genre_names: Optional[Dict[str, str]] = None
+_mood_names: Optional[Dict[str, str]] = None
+_master_lock = threading.Lock()
+
+# 生成結果: プロンプトのハッシュ -> (有効期限のUNIX時刻, 生成テキスト)
+# 有効期間(秒)が0以下の場合はキャッシュしない
+RESPONSE_CACHE_TTL = int(os.getenv("GEMINI_RESPONSE_CACHE_TTL", "0"))
+RESPONSE_CACHE_MAX_ENTRIES = 256
+# 生成結果を保存するファイル（指定した場合、再起動後も生成結果を再利用する）
+RESPONSE_CACHE_FILE = os.getenv("GEMINI_RESPONSE_CACHE_FILE") or None
+_response_cache: Dict[str, Tuple[float, str]] = {}
+_response_cache_lock = threading.Lock()
+_response_cache_loaded = False
+
+
+def update_novel_progress(novel_id: str, **progress) -> None:
+    """生成中の小説の進捗を更新する
+
+    Args:
+        novel_id: 小説のID
+        **progress: 更新する進捗情報
+            user_id (str): 小説の所有者のユーザーID
+            novel_status (NovelStatus): 小説のステータス
+            current_chapter (int | None): 現在生成中の章番号
+            last_completed_chapter (int): 先頭から連続して完成している最後の章番号
+            total_chapter_number (int): 全章数
+    """
+    with _novel_progress_lock:
+        entry = _novel_progress.setdefault(novel_id, {"version": 0})
+        entry.update(progress)
+        entry["version"] += 1
+
+
+def get_novel_progress(novel_id: str) -> Optional[dict]:
+    """生成中の小説の進捗を取得する
+
+    Args:
+        novel_id: 小説のID
+
+    Returns:
+        Optional[dict]: 進捗情報のコピー。このプロセスで生成中でない場合はNone
+    """
+    with _novel_progress_lock:
+        entry = _novel_progress.get(novel_id)
+        return dict(entry) if entry else None
+
+
+def clear_novel_progress(novel_id: str) -> None:
+    """小説の進捗をキャッシュから削除する
+
+    生成の完了・失敗時に呼び出し、以降の問い合わせをDBにフォールバックさせます。
+
+    Args:
+        novel_id: 小説のID
+    """
+    with _novel_progress_lock:
+        _novel_progress.pop(novel_id, None)
+
+
+def get_genre_names() -> Dict[str, str]:
+    """ジャンルのコードと表示名の対応を取得する
+
+    初回のみDBから読み込み、以降はキャッシュを返します。
+
+    Returns:
+        Dict[str, str]: ジャンルのコードをキー、表示名を値とする辞書
+    """
+    global _genre_names
+    if _genre_names is None:
+        with _master_lock:
+            if _genre_names is None:
+                _genre_names = dict(db.session.execute(db.select(Genre.code, Genre.genre)).all())
+    return _genre_names
+
+
+def get_mood_names() -> Dict[str, str]:
+    """ムードのコードと表示名の対応を取得する
+
+    初回のみDBから読み込み、以降はキャッシュを返します。
+
+    Returns:
+        Dict[str, str]: ムードのコードをキー、表示名を値とする辞書
+    """
+    global _mood_names
+    if _mood_names is None:
+        with _master_lock:
+            if _mood_names is None:
+                _mood_names = dict(db.session.execute(db.select(Mood.code, Mood.mood)).all())
+    return _mood_names
+
+
+def clear_master_cache() -> None:
+    """ジャンル・ムードのキャッシュを破棄する
+
+    ジャンル・ムードのテーブルを更新した場合に呼び出し、次回参照時にDBから再読み込みさせます。
+    """
+    global _genre_names, _mood_names
+    with _master_lock:
+        _genre_names = None
+        _mood_names = None
+
+
+def _response_cache_key(model_name: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model_name}\n{prompt}".encode()).hexdigest()
+
+
+def _load_response_cache() -> None:
+    """保存済みの生成結果をファイルから読み込む（初回のみ。_response_cache_lockを取得した状態で呼び出す）"""
+    global _response_cache_loaded
+    if _response_cache_loaded:
+        return
+    _response_cache_loaded = True
+    if RESPONSE_CACHE_FILE is None or not os.path.exists(RESPONSE_CACHE_FILE):
+        return
+    try:
+        with open(RESPONSE_CACHE_FILE, "rb") as f:
+            entries = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError) as e:
+        logger.warning(f"Failed to load response cache file - path: {RESPONSE_CACHE_FILE}: {e}")
+        return
+    now = time.time()
+    for key, (expires_at, text) in list(entries.items())[-RESPONSE_CACHE_MAX_ENTRIES:]:
+        if expires_at >= now:
+            _response_cache[key] = (expires_at, text)
+    logger.info(f"Response cache loaded - entries: {len(_response_cache)}")
+
+
+def _save_response_cache() -> None:
+    """生成結果をファイルに保存する（_response_cache_lockを取得した状態で呼び出す）"""
+    if RESPONSE_CACHE_FILE is None:
+        return
+    tmp_path = f"{RESPONSE_CACHE_FILE}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(orjson.dumps(_response_cache))
+        # 書き込み途中のファイルを読み込まないよう、書き込み後に置き換える
+        os.replace(tmp_path, RESPONSE_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Failed to save response cache file - path: {RESPONSE_CACHE_FILE}: {e}")
+
+
+def get_cached_response(model_name: str, prompt: str) -> Optional[str]:
+    """同一プロンプトに対する生成結果をキャッシュから取得する
+
+    Args:
+        model_name: 生成に使用するモデル名
+        prompt: 送信するプロンプト（またはプロンプトを正規化したキー）
+
+    Returns:
+        Optional[str]: キャッシュ済みの生成テキスト。未登録・期限切れ・キャッシュ無効の場合はNone
+    """
+    if RESPONSE_CACHE_TTL <= 0:
+        return None
+    key = _response_cache_key(model_name, prompt)
+    with _response_cache_lock:
+        _load_response_cache()
+        entry = _response_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, text = entry
+        if expires_at < time.time():
+            del _response_cache[key]
+            return None
+        return text
+
+
+def cache_response(model_name: str, prompt: str, text: str) -> None:
+    """生成結果をキャッシュに登録する
+
+    上限件数を超える場合は登録の古いものから破棄します。
+    GEMINI_RESPONSE_CACHE_FILEを指定している場合は、登録のたびにファイルへ保存します。
+
+    Args:
+        model_name: 生成に使用したモデル名
+        prompt: 送信したプロンプト（またはプロンプトを正規化したキー）
+        text: 生成されたテキスト
+    """
+    if RESPONSE_CACHE_TTL <= 0:
+        return
+    key = _response_cache_key(model_name, prompt)
+    with _response_cache_lock:
+        _load_response_cache()
+        _response_cache.pop(key, None)
+        while len(_response_cache) >= RESPONSE_CACHE_MAX_ENTRIES:
+            del _response_cache[next(iter(_response_cache))]
+        _response_cache[key] = (time.time() + RESPONSE_CACHE_TTL, text)
+        _save_response_cache()
@@ -1,46 +1,190 @@
+import hashlib
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, Optional
 
 from google import generativeai as genai
 
 from src.services.gemini_exceptions import NetworkError
 from src.services.gemini_exceptions import TimeoutError as GeminiTimeoutError
-from src.services.gemini_retry import retry_for_json_generation, retry_for_novel_generation
+from src.services.gemini_retry import retry_for_json_generation, retry_for_novel_generation, retry_for_quick_request
 from src.services.gemini_validator import (
+    NOVEL_INIT_SCHEMA,
     get_response_metadata,
+    get_safe_chunk_text,
     get_safe_text,
+    parse_and_validate_novel_init,
+    to_response_schema,
     validate_novel_init_json,
 )
+from src.services.novel_cache import cache_response, get_cached_response
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# 使用できるモデルバージョン
+VALID_MODEL_VERSIONS = frozenset({"2.0-flash", "2.5-flash"})
+
+# プロセス内で共有するGenerativeModel（環境変数の読み込みとAPIクライアントの初期化を初回のみ行う）
+_shared_model: Optional[genai.GenerativeModel] = None
+_shared_model_lock = threading.Lock()
+
+# プロンプトのテンプレート
+# Geminiの暗黙的キャッシュは先頭から一致する部分にのみ効くため、固定の指示を先頭に置き、
+# 依頼ごとに変わる値（小説ごとに変わるもの→章ごとに変わるものの順）を後ろに置く
+_PLOT_TMPL = "小説のプロットを具体的に作成してください。\n- ジャンル: {genre}\n- 小説の文字数: {text_length}文字程度"
+_TITLE_TMPL = "小説のタイトルを1つだけ考えてください。タイトルのみを出力してください。\n- ジャンル: {genre}"
+_INIT_TMPL = """小説を作成するのに、設定やプロット、登場人物等を具体的に作成してください。
+出力は以下のjson形式で行ってください、その他は一切出力してはいけません。:
+{{
+    "title":(novel's title),
+    "summary":(summary),
+    "plot":(plot),
+    "characters":[
+        {{
+            "name":(name),
+            "role":(role)
+        }},
+        (generate characters you needed)
+    ],
+    "chapter_plots":[
+        {{
+            "plot":(plot)
+        }},
+        (generate same number of items as chapters)
+    ]
+}}
+
+作成する小説の内容は下記の通りです。小説は全体で{text_length}文字程度、章は{chapter_count}です。
+- ジャンル: {genre}
+- 雰囲気: {mood}
+- 文章スタイル: {style}
+"""
+# 前回の出力がJSONの検証に失敗した場合に、エラー内容を伝えて修正させるための追記
+_INIT_FEEDBACK_TMPL = "\n前回の出力はエラーがありました: {feedback}\n修正して再出力してください。\n"
+_CHAPTER_TMPL = (
+    "小説の指定された章を、以下の全体プロットと情報を参考に生成してください。\n"
+    "- 全体プロット:{plot}{style_clause}\n- 章: 第{chapter_num}章{prev_clause}"
+)
+# コンテキストキャッシュにプロットを載せている場合の章生成テンプレート
+_CACHED_CHAPTER_TMPL = (
+    "全体プロットに沿って、小説の指定された章を以下の情報を参考に生成してください。"
+    "{style_clause}\n- 章: 第{chapter_num}章{prev_clause}"
+)
+# 初期データ生成ではJSONモードを使い、検証用と同じスキーマに沿ったJSONのみを出力させる
+_INIT_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": to_response_schema(NOVEL_INIT_SCHEMA),
+}
+_STYLE_CLAUSE = "\n- 文体:{}"
+_PREV_CLAUSE = "\n下記は前の章です:\n{}"
+# プロンプトに含める前の章の末尾の文字数（日本語の本文は1文字が概ね1トークンのため、トークン数の目安にもなる）
+_PREV_TAIL_CHARS = 2000
+# コンテキストキャッシュの作成を試みるプロットの最小文字数
+# （gemini-2.0-flashのキャッシュの最小トークン数は4096。日本語は1文字が概ね1トークンのため、
+#   これに満たないプロットでは失敗するだけのAPI呼び出しを行わない）
+_PLOT_CACHE_MIN_CHARS = 4096
+# 小説の生成中に使うコンテキストキャッシュの有効期間
+_PLOT_CACHE_TTL = timedelta(minutes=10)
+# コンテキストキャッシュの有効期限までの残りがこれ以下になったら延長する（章の生成のタイムアウトと同じ）
+_PLOT_CACHE_EXTEND_MARGIN = timedelta(seconds=600)
+
+# 応答キャッシュで同じ依頼とみなす目標文字数の刻み
+# （5000文字と5200文字のような近い依頼には、同じプロット・初期データを再利用する）
+_CACHE_TEXT_LENGTH_STEP = 1000
+# 応答キャッシュのキーに含めるテンプレートの識別子
+# （キャッシュをファイルに保存している場合、テンプレートを変更すると以前の生成結果を使わないようにする）
+_PROMPT_VERSION = hashlib.sha256(f"{_PLOT_TMPL}\n{_INIT_TMPL}".encode()).hexdigest()[:8]
+
+
+def _cache_key(kind: str, text_length, *settings) -> str:
+    """応答キャッシュのキーを作成する
+
+    プロンプトそのものではなく、目標文字数を刻みに丸め、設定の表記揺れ（前後の空白・大文字小文字）を
+    除いた値をキーにすることで、ほぼ同じ依頼でもキャッシュを再利用できるようにします。
+
+    Args:
+        kind: 生成の種類（種類ごとにキーを分ける）
+        text_length: 目標文字数
+        *settings: その他の生成条件
+
+    Returns:
+        str: キャッシュのキー
+    """
+    if isinstance(text_length, (int, float)):
+        text_length = max(
+            _CACHE_TEXT_LENGTH_STEP, round(text_length / _CACHE_TEXT_LENGTH_STEP) * _CACHE_TEXT_LENGTH_STEP
+        )
+    normalized = [str(v).strip().casefold() for v in settings]
+    return "\n".join([kind, _PROMPT_VERSION, str(text_length), *normalized])
+
+
+@contextmanager
+def _translate_errors(method: str, target: str, timeout_seconds: int) -> Iterator[None]:
+    """標準ライブラリの通信エラーをGemini例外にラップする
+
+    ConnectionErrorをNetworkErrorに、TimeoutErrorをGeminiTimeoutErrorに変換し、リトライの対象にします。
+    その他のエラー（GeminiAPIErrorは検証で既に変換済み）はそのまま投げます。
+
+    Args:
+        method: ログに含めるメソッド名
+        target: エラーメッセージに含める生成対象（例: "plot"）
+        timeout_seconds: リクエストのタイムアウト(秒)
+
+    Raises:
+        NetworkError: ConnectionErrorが発生した場合
+        GeminiTimeoutError: TimeoutErrorが発生した場合
+    """
+    try:
+        yield
+    except ConnectionError as e:
+        logger.error(f"Network error in {method}: {e}")
+        raise NetworkError(message=f"Network error while generating {target}: {str(e)}", original_error=e)
+    except TimeoutError as e:
+        logger.error(f"Timeout error in {method}: {e}")
+        raise GeminiTimeoutError(
+            message=f"Timeout while generating {target}: {str(e)}", timeout_seconds=timeout_seconds
+        )
+
 
 # 小説生成系を担当するクラス
 class NovelGenerator:
+    __slots__ = ("model", "is_generating", "title")
+
     def __init__(self):
         self.model = None
         self.is_generating = False
+        self.title = None
 
     def setup_ai(self):
         """Gemini APIの初期設定を行う
 
         環境変数からAPIキーとモデルバージョンを読み込み、GenerativeModelを初期化します。
+        GenerativeModelはプロセス内で共有し、環境変数の読み込みと初期化は初回のみ行います。
 
         Raises:
-            ValueError: モデルバージョンが不正な場合
+            ValueError: APIキーが未設定、またはモデルバージョンが不正な場合
         """
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is not set")
-
-        genai.configure(api_key=api_key)
-        model_version = os.getenv("GEMINI_MODEL", "2.0-flash")
-        if model_version not in ["2.0-flash", "2.5-flash"]:
-            raise ValueError(f"Invalid GEMINI_MODEL: {model_version}. Must be '2.0-flash' or '2.5-flash'.")
-
-        self.model = genai.GenerativeModel(f"gemini-{model_version}")
-        logger.info(f"Gemini API initialized with model: gemini-{model_version}")
+        global _shared_model
+        if _shared_model is None:
+            with _shared_model_lock:
+                if _shared_model is None:
+                    api_key = os.getenv("GEMINI_API_KEY")
+                    if not api_key:
+                        raise ValueError("GEMINI_API_KEY environment variable is not set")
+
+                    model_version = os.getenv("GEMINI_MODEL", "2.0-flash")
+                    if model_version not in VALID_MODEL_VERSIONS:
+                        raise ValueError(f"Invalid GEMINI_MODEL: {model_version}. Must be '2.0-flash' or '2.5-flash'.")
+
+                    genai.configure(api_key=api_key)
+                    _shared_model = genai.GenerativeModel(f"gemini-{model_version}")
+                    logger.info(f"Gemini API initialized with model: gemini-{model_version}")
+        self.model = _shared_model
 
     @retry_for_novel_generation
     def generate_plot(self, genre: str, text_length: int) -> str:
@@ -61,9 +205,16 @@ class NovelGenerator:
         """
         logger.info(f"Generating plot for genre='{genre}', text_length={text_length}")
 
-        try:
+        with _translate_errors("generate_plot", "plot", timeout_seconds=600):
+            prompt = _PLOT_TMPL.format(genre=genre, text_length=text_length)
+            cache_key = _cache_key("plot", text_length, genre)
+            cached = get_cached_response(self.model.model_name, cache_key)
+            if cached is not None:
+                logger.info("Plot served from response cache")
+                return cached
+
             response = self.model.generate_content(
-                f"{genre}の小説のプロットを具体的に作成してください。小説は{text_length}文字程度になります。",
+                prompt,
                 request_options={"timeout": 600},
             )
 
@@ -71,29 +222,43 @@ class NovelGenerator:
             text = get_safe_text(response, context="generate_plot")
 
             # メタデータをログに記録
-            metadata = get_response_metadata(response)
+            metadata = get_response_metadata(response, include_safety_ratings=False)
             logger.info(f"Plot generated successfully. Tokens used: {metadata.get('total_token_count', 'N/A')}")
 
+            cache_response(self.model.model_name, cache_key, text)
             return text
 
-        except Exception as e:
-            # 標準ライブラリのエラーをGemini例外にラップ
-            if isinstance(e, ConnectionError):
-                logger.error(f"Network error in generate_plot: {e}")
-                raise NetworkError(message=f"Network error while generating plot: {str(e)}", original_error=e)
-            elif isinstance(e, TimeoutError):
-                logger.error(f"Timeout error in generate_plot: {e}")
-                raise GeminiTimeoutError(message=f"Timeout while generating plot: {str(e)}", timeout_seconds=600)
-            else:
-                # その他のエラーはそのまま投げる（GeminiAPIErrorは既に処理済み）
-                raise
+    @retry_for_quick_request
+    def generate_title(self, genre: str) -> str:
+        """小説のタイトルを生成する
+
+        プロット生成と並行して呼び出せるよう、ジャンルのみからタイトルを生成します。
+
+        Args:
+            genre: 小説のジャンル
+
+        Returns:
+            str: 生成されたタイトル
+
+        Raises:
+            GeminiAPIError: API呼び出しでエラーが発生した場合
+        """
+        logger.info(f"Generating title for genre='{genre}'")
+
+        with _translate_errors("generate_title", "title", timeout_seconds=60):
+            response = self.model.generate_content(
+                _TITLE_TMPL.format(genre=genre),
+                request_options={"timeout": 60},
+            )
+            return get_safe_text(response, context="generate_title").strip()
 
     @retry_for_json_generation
-    def generate_init(self, text_length: int, chapter_count: int, other: dict) -> dict:
+    def generate_init(self, text_length: int, chapter_count: int, other: dict, feedback: Optional[str] = None) -> dict:
         """小説の初期データ（設定、プロット、登場人物等）を生成する
 
         JSON形式で小説の基本情報を生成します。
         自動リトライ機構により、JSON解析エラーからの復旧も試みます。
+        リトライ時は前回の検証エラーがfeedbackに渡され、プロンプトに追記されます。
 
         Args:
             text_length: 目標文字数
@@ -102,6 +267,7 @@ class NovelGenerator:
                 genre (str): ジャンル
                 mood (str): 雰囲気
                 style (str): 文体
+            feedback: 前回の出力の検証エラー（retry_for_json_generationが設定する）
 
         Returns:
             dict: 小説の初期データ（title, summary, plot, characters, chapter_plots）
@@ -118,44 +284,33 @@ class NovelGenerator:
             f"Generating initial data: text_length={text_length}, chapter_count={chapter_count}, genre='{genre}', mood='{mood}', style='{style}'"
         )
 
-        try:
+        with _translate_errors("generate_init", "initial data", timeout_seconds=600):
+            prompt = _INIT_TMPL.format(
+                text_length=text_length, chapter_count=chapter_count, genre=genre, mood=mood, style=style
+            )
+            if feedback:
+                prompt += _INIT_FEEDBACK_TMPL.format(feedback=feedback)
+            cache_key = _cache_key("init", text_length, chapter_count, genre, mood, style)
+            cached = get_cached_response(self.model.model_name, cache_key)
+            if cached is not None:
+                logger.info("Initial data served from response cache")
+                return validate_novel_init_json(cached, expected_chapter_count=chapter_count, context="generate_init")
+
             response = self.model.generate_content(
-                f"""下記の内容の小説を作成するのに、設定やプロット、登場人物等を具体的に作成してください。小説は全体で{text_length}文字程度、章は{chapter_count}です。
-            - ジャンル: {genre}
-            - 雰囲気: {mood}
-            - 文章スタイル: {style}
-
-            出力は以下のjson形式で行ってください、その他は一切出力してはいけません。:
-            {{
-                "title":(novel's title),
-                "summary":(summary),
-                "plot":(plot),
-                "characters":[
-                    {{
-                        "name":(name),
-                        "role":(role)
-                    }},
-                    (generate characters you needed)
-                ],
-                "chapter_plots":[
-                    {{
-                        "plot":(plot)
-                    }},
-                    (generate same number of items as chapters)
-                ]
-            }}
-            """,
+                prompt,
+                generation_config=_INIT_GENERATION_CONFIG,
                 request_options={"timeout": 600},
             )
 
-            # レスポンスを検証して安全にテキストを取得
-            text = get_safe_text(response, context="generate_init")
-
-            # JSONを検証してパース（章の数もチェック）
-            data = validate_novel_init_json(text, expected_chapter_count=chapter_count, context="generate_init")
+            # レスポンスを検証し、JSONを検証してパース（章の数もチェック）
+            data, text = parse_and_validate_novel_init(
+                response, expected_chapter_count=chapter_count, context="generate_init"
+            )
+            # 検証に通った応答のみをキャッシュする
+            cache_response(self.model.model_name, cache_key, text)
 
             # メタデータをログに記録
-            metadata = get_response_metadata(response)
+            metadata = get_response_metadata(response, include_safety_ratings=False)
             logger.info(
                 f"Initial data generated successfully. "
                 f"Title: '{data.get('title', 'N/A')}', "
@@ -166,22 +321,15 @@ class NovelGenerator:
 
             return data
 
-        except Exception as e:
-            # 標準ライブラリのエラーをGemini例外にラップ
-            if isinstance(e, ConnectionError):
-                logger.error(f"Network error in generate_init: {e}")
-                raise NetworkError(message=f"Network error while generating initial data: {str(e)}", original_error=e)
-            elif isinstance(e, TimeoutError):
-                logger.error(f"Timeout error in generate_init: {e}")
-                raise GeminiTimeoutError(
-                    message=f"Timeout while generating initial data: {str(e)}", timeout_seconds=600
-                )
-            else:
-                # その他のエラーはそのまま投げる（GeminiAPIErrorは既に処理済み）
-                raise
-
     @retry_for_novel_generation
-    def generate_chapter(self, plot: str, style: str = "", previous_chapter: str = None, chapter_num: int = 0) -> str:
+    def generate_chapter(
+        self,
+        plot: str,
+        style: str = "",
+        previous_chapter: str = None,
+        chapter_num: int = 0,
+        cached_model: genai.GenerativeModel = None,
+    ) -> str:
         """小説の章を生成する
 
         指定されたプロットと設定に基づいて、特定の章の内容を生成します。
@@ -192,6 +340,7 @@ class NovelGenerator:
             style: 文体（オプション）
             previous_chapter: 前の章の内容（オプション）
             chapter_num: 章番号
+            cached_model: プロットをキャッシュしたモデル（オプション）。指定した場合はプロンプトにプロットを含めない
 
         Returns:
             str: 生成された章の内容
@@ -201,17 +350,24 @@ class NovelGenerator:
         """
         logger.info(f"Generating chapter {chapter_num}")
 
-        try:
-            # プロンプトを構築
-            prompt = f"{plot}の小説の第{chapter_num}章を、以下の情報を参考に生成してください。"
-            if style and isinstance(style, str):
-                prompt += f"\n- 文体:{style}"
-            if previous_chapter:
-                # 前の章が長すぎる場合は末尾のみを使用（コンテキスト節約）
-                prev_excerpt = previous_chapter[-2000:] if len(previous_chapter) > 2000 else previous_chapter
-                prompt += f"\n下記は前の章です:\n{prev_excerpt}"
+        with _translate_errors(
+            f"generate_chapter (chapter {chapter_num})", f"chapter {chapter_num}", timeout_seconds=600
+        ):
+            # 応答キャッシュのキーには、コンテキストキャッシュの有無によらずプロットを含むプロンプトを使う
+            cache_key = self._build_chapter_prompt(plot, style, previous_chapter, chapter_num)
+            cached = get_cached_response(self.model.model_name, cache_key)
+            if cached is not None:
+                logger.info(f"Chapter {chapter_num} served from response cache")
+                return cached
+
+            if cached_model is not None:
+                model = cached_model
+                prompt = self._build_chapter_prompt(None, style, previous_chapter, chapter_num)
+            else:
+                model = self.model
+                prompt = cache_key
 
-            response = self.model.generate_content(
+            response = model.generate_content(
                 prompt,
                 request_options={"timeout": 600},
             )
@@ -220,48 +376,209 @@ class NovelGenerator:
             text = get_safe_text(response, context=f"generate_chapter_{chapter_num}")
 
             # メタデータをログに記録
-            metadata = get_response_metadata(response)
+            metadata = get_response_metadata(response, include_safety_ratings=False)
             logger.info(
                 f"Chapter {chapter_num} generated successfully. "
                 f"Length: {len(text)} chars, "
                 f"Tokens used: {metadata.get('total_token_count', 'N/A')}"
             )
 
+            cache_response(self.model.model_name, cache_key, text)
             return text
 
+    def create_plot_cache(self, plot: str, ttl: timedelta = _PLOT_CACHE_TTL):
+        """小説の全体プロットをGeminiのコンテキストキャッシュに登録する
+
+        章ごとのプロンプトでプロットを毎回送信せずに済むよう、プロットをキャッシュします。
+        キャッシュの最小トークン数に満たない場合などで作成に失敗した場合はNoneを返し、
+        呼び出し側はプロットを含む通常のプロンプトで生成を続けます。
+
+        Args:
+            plot: 小説の全体プロット
+            ttl: キャッシュの有効期間
+
+        Returns:
+            CachedContent | None: 作成したキャッシュ。プロットが短い場合や作成に失敗した場合はNone
+        """
+        if len(plot) < _PLOT_CACHE_MIN_CHARS:
+            return None
+        try:
+            cache = genai.caching.CachedContent.create(
+                model=self.model.model_name,
+                system_instruction="あなたは小説家です。与えられた全体プロットに沿って小説の章を執筆してください。",
+                contents=[f"小説の全体プロット:\n{plot}"],
+                ttl=ttl,
+            )
+        except Exception as e:
+            logger.warning(f"Failed to create plot cache, sending the plot with each prompt instead: {e}")
+            return None
+
+        logger.info(f"Plot cache created: {cache.name}")
+        return cache
+
+    def extend_plot_cache(self, cache, ttl: timedelta) -> bool:
+        """章の生成中に期限切れにならないよう、必要な場合のみコンテキストキャッシュの有効期間を延長する
+
+        有効期限までの残りが章の生成のタイムアウト以下の場合のみ、延長のAPIを呼び出します。
+
+        Args:
+            cache: create_plot_cache()で作成したキャッシュ
+            ttl: 延長後の有効期間
+
+        Returns:
+            bool: キャッシュを引き続き使える場合はTrue。延長に失敗した場合はFalse
+        """
+        expire_time = getattr(cache, "expire_time", None)
+        if expire_time and expire_time - datetime.now(timezone.utc) > _PLOT_CACHE_EXTEND_MARGIN:
+            return True
+        try:
+            cache.update(ttl=ttl)
         except Exception as e:
-            # 標準ライブラリのエラーをGemini例外にラップ
-            if isinstance(e, ConnectionError):
-                logger.error(f"Network error in generate_chapter (chapter {chapter_num}): {e}")
-                raise NetworkError(
-                    message=f"Network error while generating chapter {chapter_num}: {str(e)}", original_error=e
-                )
-            elif isinstance(e, TimeoutError):
-                logger.error(f"Timeout error in generate_chapter (chapter {chapter_num}): {e}")
-                raise GeminiTimeoutError(
-                    message=f"Timeout while generating chapter {chapter_num}: {str(e)}", timeout_seconds=600
-                )
+            logger.warning(f"Failed to extend plot cache, sending the plot with each prompt instead: {e}")
+            return False
+        return True
+
+    def model_from_cache(self, cache) -> genai.GenerativeModel:
+        """コンテキストキャッシュを参照するモデルを作成する
+
+        Args:
+            cache: create_plot_cache()で作成したキャッシュ
+
+        Returns:
+            genai.GenerativeModel: generate_chapter()などのcached_modelに渡すモデル
+        """
+        return genai.GenerativeModel.from_cached_content(cached_content=cache)
+
+    def generate_chapter_stream(
+        self,
+        plot: str,
+        style: str = "",
+        previous_chapter: str = None,
+        chapter_num: int = 0,
+        cached_model: genai.GenerativeModel = None,
+    ) -> Iterator[str]:
+        """小説の章をストリーミングで生成する
+
+        generate_chapter()と同じプロンプトで、生成されたテキストを断片ごとに返します。
+        断片をクライアントへ送信済みの可能性があるため、自動リトライは行いません。
+
+        Args:
+            plot: 小説の全体プロット
+            style: 文体（オプション）
+            previous_chapter: 前の章の内容（オプション）
+            chapter_num: 章番号
+            cached_model: プロットをキャッシュしたモデル（オプション）。指定した場合はプロンプトにプロットを含めない
+
+        Yields:
+            str: 生成された章の断片
+
+        Raises:
+            GeminiAPIError: API呼び出しでエラーが発生した場合
+        """
+        logger.info(f"Generating chapter {chapter_num} (stream)")
+
+        with _translate_errors(
+            f"generate_chapter_stream (chapter {chapter_num})", f"chapter {chapter_num}", timeout_seconds=600
+        ):
+            if cached_model is not None:
+                model = cached_model
+                prompt = self._build_chapter_prompt(None, style, previous_chapter, chapter_num)
             else:
-                # その他のエラーはそのまま投げる（GeminiAPIErrorは既に処理済み）
-                raise
+                model = self.model
+                prompt = self._build_chapter_prompt(plot, style, previous_chapter, chapter_num)
+
+            response = model.generate_content(
+                prompt,
+                stream=True,
+                request_options={"timeout": 600},
+            )
+
+            length = 0
+            for chunk in response:
+                # 断片を検証して安全にテキストを取得
+                text = get_safe_chunk_text(chunk, context=f"generate_chapter_stream_{chapter_num}")
+                if text:
+                    length += len(text)
+                    yield text
+
+            # メタデータをログに記録
+            metadata = get_response_metadata(response, include_safety_ratings=False)
+            logger.info(
+                f"Chapter {chapter_num} streamed successfully. "
+                f"Length: {length} chars, "
+                f"Tokens used: {metadata.get('total_token_count', 'N/A')}"
+            )
+
+    def _build_chapter_prompt(self, plot: str, style: str, previous_chapter: str, chapter_num: int) -> str:
+        """章生成用のプロンプトを構築する
+
+        Args:
+            plot: 小説の全体プロット（コンテキストキャッシュ済みの場合はNone）
+            style: 文体
+            previous_chapter: 前の章の内容
+            chapter_num: 章番号
+
+        Returns:
+            str: プロンプト
+        """
+        # 前の章が長すぎる場合は末尾のみを使用（コンテキスト節約。トークン数はAPIに問い合わせず文字数で見積もる）
+        fields = {
+            "plot": plot,
+            "chapter_num": chapter_num,
+            "style_clause": _STYLE_CLAUSE.format(style) if style and isinstance(style, str) else "",
+            "prev_clause": _PREV_CLAUSE.format(previous_chapter[-_PREV_TAIL_CHARS:]) if previous_chapter else "",
+        }
+        return (_CHAPTER_TMPL if plot is not None else _CACHED_CHAPTER_TMPL).format_map(fields)
 
     # 小説生成のジェネレーター.
+    # (0, プロット)を返した後、各章の断片を(章番号, 断片)として生成された順に返す.
     def generate_novel(self, genre, text_length, style):
         self.is_generating = True
-        plot = self.generate_plot(genre, text_length)
-        yield 0, plot
-        total_text_len = 0
-        previous_chapter = None
-        count = 1
-        while True:
-            chapter = self.generate_chapter(
-                plot=plot, style=style, previous_chapter=previous_chapter, chapter_num=count
-            )
-            total_text_len += len(chapter)
-            previous_chapter = chapter
-            yield count, chapter
-            if total_text_len > text_length:
-                self.is_generating = False
-                return
-            previous_chapter = chapter
-            count += 1
+        try:
+            # タイトルはプロットに依存しないため、プロット生成と並行して問い合わせる
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                title_future = pool.submit(self.generate_title, genre)
+                plot = self.generate_plot(genre, text_length)
+                try:
+                    self.title = title_future.result()
+                except Exception as e:
+                    # タイトルが取れなくても本文の生成は続ける
+                    logger.warning(f"Failed to generate title: {e}")
+                    self.title = None
+            yield 0, plot
+
+            # 各章のプロンプトでプロットを再送しないよう、コンテキストキャッシュを使う
+            cache = self.create_plot_cache(plot)
+            cached_model = self.model_from_cache(cache) if cache else None
+            try:
+                total_text_len = 0
+                previous_chapter = None
+                count = 1
+                while total_text_len <= text_length:
+                    # 章数に上限がないため、章ごとに期限を確認し、延長できなければプロットを含むプロンプトに戻す
+                    if cached_model and not self.extend_plot_cache(cache, _PLOT_CACHE_TTL):
+                        cached_model = None
+                    pieces = []
+                    for piece in self.generate_chapter_stream(
+                        plot=plot,
+                        style=style,
+                        previous_chapter=previous_chapter,
+                        chapter_num=count,
+                        cached_model=cached_model,
+                    ):
+                        pieces.append(piece)
+                        yield count, piece
+                    chapter = "".join(pieces)
+                    total_text_len += len(chapter)
+                    # 次の章のプロンプトには末尾しか使わないため、末尾のみを保持する
+                    previous_chapter = chapter[-_PREV_TAIL_CHARS:]
+                    count += 1
+            finally:
+                if cache:
+                    try:
+                        cache.delete()
+                    except Exception as e:
+                        logger.warning(f"Failed to delete plot cache {cache.name}: {e}")
+        finally:
+            # 例外や途中でのclose()でも生成中の状態を残さない
+            self.is_generating = False
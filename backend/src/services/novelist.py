@@ -1,16 +1,42 @@
-import json
 import logging
-from typing import Optional
+from datetime import timedelta
+from typing import Optional, Union
+
+import orjson
 
 from src.services.novel_generator import NovelGenerator
 
 # ロガーの設定
 logger = logging.getLogger(__name__)
 
+# 全体プロットのコンテキストキャッシュの有効期間（章の生成前ごとに延長する）
+# 章の生成のタイムアウト(600秒)より長くし、生成中に期限切れにならないようにする
+PLOT_CACHE_TTL = timedelta(minutes=15)
+
+# init_dataのうち、other_novel_dataに含めない（個別の属性で保持する）キー
+_RESERVED_INIT_KEYS = frozenset(("plot", "chapter_plots"))
+
 
 class Novelist:
     """NovelGeneratorを使いやすくするためのラッパ"""
 
+    # リクエストごとに生成されるため、インスタンスの__dict__を持たせない
+    __slots__ = (
+        "generator",
+        "plot",
+        "chapter_plots",
+        "init_data",
+        "plot_cache",
+        "cached_model",
+        "previous_chapter_content",
+        "next_chapter_num",
+        "chapter_count",
+        "total_text_length",
+        "target_text_length",
+        "other_settings",
+        "other_novel_data",
+    )
+
     def __init__(self):
         # generator
         self.generator = NovelGenerator()
@@ -19,6 +45,9 @@ class Novelist:
         self.plot = ""
         self.chapter_plots = []
         self.init_data = ""
+        # 全体プロットのコンテキストキャッシュとそれを参照するモデル（create_plot_cache()で作成）
+        self.plot_cache = None
+        self.cached_model = None
         # chapter
         self.previous_chapter_content = ""
         self.next_chapter_num = 1
@@ -31,15 +60,15 @@ class Novelist:
         self.other_novel_data = {}
 
     def calc_chapter_count(self, text_length):
-        # 4000未満->1 , 4000以上->textLen/2000
-        return 1 if text_length < 4000 else int(text_length / 2000)
+        # 4000未満->1 , 4000以上->textLen/2000（2000〜3999も整数除算で1になる）
+        return max(1, int(text_length) // 2000)
 
-    def set_first_params(self, text_length, others={}):
+    def set_first_params(self, text_length, others: Optional[dict] = None):
         """小説生成のためのパラメータを設定する
 
         Args:
             text_length (int): text_length
-            others (dict): other settings
+            others (Optional[dict]): other settings
                 genre (str): ジャンル
                 mood (str): 雰囲気
                 style (str): 文体
@@ -47,8 +76,7 @@ class Novelist:
         self.target_text_length = text_length
         if not isinstance(others, dict):
             return
-        for key, value in others.items():
-            self.other_settings[key] = value
+        self.other_settings.update(others)
 
     def prepare_novel(self):
         """plotと章の数を準備
@@ -65,13 +93,13 @@ class Novelist:
         # generate_init()はdictを返す（エラーは上位に伝播）
         generated = self.generator.generate_init(self.target_text_length, self.chapter_count, self.other_settings)
 
-        # ログ用にJSON文字列化
-        self.init_data = json.dumps(generated, ensure_ascii=False, indent=2)
-        logger.debug(f"Generated initial data:\n{self.init_data}")
+        # DBに保存するためにJSON文字列化（リトライ時にload_from_init_data()で復元する）
+        self.init_data = orjson.dumps(generated).decode()
+        logger.debug("Generated initial data:\n%s", self.init_data)
 
         self.plot = generated.get("plot", "")
         self.chapter_plots = generated.get("chapter_plots", [])
-        self.other_novel_data = {k: v for k, v in generated.items() if k not in ["plot", "chapter_plots"]}
+        self.other_novel_data = {k: v for k, v in generated.items() if k not in _RESERVED_INIT_KEYS}
 
         # チャプター数とプロット数の不整合チェック
         if len(self.chapter_plots) != self.chapter_count:
@@ -81,7 +109,7 @@ class Novelist:
                 f"AIが生成した章の数 {len(self.chapter_plots)}"
             )
 
-    def load_from_init_data(self, init_data_json: str):
+    def load_from_init_data(self, init_data_json: Union[str, dict]):
         """既存のinit_dataから小説の状態を復元する
 
         データベースに保存されているinit_data（JSON文字列）から
@@ -89,10 +117,10 @@ class Novelist:
         next_chapter_numとprevious_chapter_contentは呼び出し側で設定する必要があります。
 
         Args:
-            init_data_json: JSON文字列形式のinit_data
+            init_data_json: JSON文字列形式のinit_data（パース済みのdictも受け付ける）
 
         Raises:
-            json.JSONDecodeError: JSONのパースに失敗した場合
+            orjson.JSONDecodeError: JSONのパースに失敗した場合
             KeyError: 必須キーが存在しない場合
             ValueError: チャプター数とプロット数に不整合がある場合
 
@@ -102,8 +130,8 @@ class Novelist:
             >>> novelist.next_chapter_num = 3  # 第3章から再開する場合
             >>> novelist.previous_chapter_content = chapter2_content
         """
-        # JSON文字列をパース
-        generated = json.loads(init_data_json)
+        # JSON文字列をパース（パース済みの場合はそのまま使う）
+        generated = init_data_json if isinstance(init_data_json, dict) else orjson.loads(init_data_json)
 
         # 必須キーの確認
         if "plot" not in generated:
@@ -111,13 +139,13 @@ class Novelist:
         if "chapter_plots" not in generated:
             raise KeyError("Missing required key 'chapter_plots' in init_data")
 
-        # init_dataを保存
-        self.init_data = init_data_json
+        # init_dataを保存（DBに保存する形式はJSON文字列）
+        self.init_data = orjson.dumps(generated).decode() if isinstance(init_data_json, dict) else init_data_json
 
         # 各フィールドを復元
         self.plot = generated["plot"]
         self.chapter_plots = generated.get("chapter_plots", [])
-        self.other_novel_data = {k: v for k, v in generated.items() if k not in ["plot", "chapter_plots"]}
+        self.other_novel_data = {k: v for k, v in generated.items() if k not in _RESERVED_INIT_KEYS}
         self.chapter_count = len(self.chapter_plots)
 
         # チャプター数の検証
@@ -126,6 +154,36 @@ class Novelist:
 
         logger.info(f"Loaded from init_data: {self.chapter_count} chapters")
 
+    def create_plot_cache(self) -> None:
+        """残りの章の生成で使うため、全体プロットをGeminiのコンテキストキャッシュに登録する
+
+        登録に成功した場合、以降のwrite_next_chapter()はプロットを含まないプロンプトで章を生成します。
+        登録できなかった場合は何もせず、プロットを含む通常のプロンプトで生成を続けます。
+        生成の完了・失敗時にはdelete_plot_cache()を呼び出してください。
+        """
+        self.plot_cache = self.generator.create_plot_cache(self.plot, ttl=PLOT_CACHE_TTL)
+        self.cached_model = self.generator.model_from_cache(self.plot_cache) if self.plot_cache else None
+
+    def delete_plot_cache(self) -> None:
+        """全体プロットのコンテキストキャッシュを削除する"""
+        cache, self.plot_cache, self.cached_model = self.plot_cache, None, None
+        if cache is None:
+            return
+        try:
+            cache.delete()
+        except Exception as e:
+            logger.warning(f"Failed to delete plot cache {cache.name}: {e}")
+
+    def _extend_plot_cache(self) -> None:
+        """章の生成中に期限切れにならないよう、期限が近い場合はコンテキストキャッシュの有効期間を延長する
+
+        延長に失敗した場合はキャッシュを使わず、プロットを含む通常のプロンプトで生成を続けます。
+        """
+        if self.plot_cache is None:
+            return
+        if not self.generator.extend_plot_cache(self.plot_cache, PLOT_CACHE_TTL):
+            self.delete_plot_cache()
+
     def write_next_chapter(self):
         """チャプターを一つ生成
 
@@ -138,20 +196,23 @@ class Novelist:
         Raises:
             GeminiAPIError: 章の生成でエラーが発生した場合
         """
+        self._extend_plot_cache()
+
         # 章を生成（エラーは上位に伝播）
         self.previous_chapter_content = self.generator.generate_chapter(
             self.plot,
             self.other_settings.get("style", ""),
             previous_chapter=self.previous_chapter_content if self.next_chapter_num != 1 else None,
             chapter_num=self.next_chapter_num,
+            cached_model=self.cached_model,
         )
         self.next_chapter_num += 1
         self.total_text_length += len(self.previous_chapter_content)
         logger.debug(
-            f"Generated chapter - "
-            f"Next: {self.next_chapter_num}, "
-            f"Total text length: {self.total_text_length}, "
-            f"Chapter length: {len(self.previous_chapter_content)}"
+            "Generated chapter - Next: %d, Total text length: %d, Chapter length: %d",
+            self.next_chapter_num,
+            self.total_text_length,
+            len(self.previous_chapter_content),
         )
         return self.previous_chapter_content
 
@@ -221,8 +282,8 @@ class Novelist:
         return content
 
     def chapter_generator(self):
-        while self.next_chapter_num != self.chapter_count + 1:
+        for _ in range(self.next_chapter_num, self.chapter_count + 1):
             yield self.write_next_chapter()
 
     def is_completed(self):
-        return self.next_chapter_num == self.chapter_count + 1
+        return self.next_chapter_num > self.chapter_count
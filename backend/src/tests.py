@@ -1,5 +1,6 @@
 from flask import Blueprint, request
 from flask_restx import Namespace, Resource, fields
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.database import db
 from src.models import Test
@@ -42,18 +43,24 @@ class TestAccess(Resource):
     """
 
     @api.doc("get_test")
-    @api.marshal_list_with(test_item_model)
+    @api.response(200, "テスト用データの一覧", [test_item_model])
     def get(self):
         """testsテーブルのすべての行を取得する
 
+        test_item_modelで返す列のみをSELECTし、marshalを経由せずに辞書を組み立てます。
+
         Returns:
             dict: 取得したデータの情報
         """
         try:
-            tests = db.session.query(Test).all()
-            return tests
-        except Exception as e:
-            return {"error": str(e)}
+            rows = db.session.execute(db.select(Test.id, Test.content, Test.created_at, Test.updated_at)).all()
+            return [
+                {"test_id": row.id, "content": row.content, "created_at": row.created_at, "updated_at": row.updated_at}
+                for row in rows
+            ]
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            api.abort(500, str(e))
 
     @api.doc("post_test")
     @api.expect(test_insert_and_update_model)
@@ -64,17 +71,19 @@ class TestAccess(Resource):
         Returns:
             dict: 登録したデータの情報
         """
+        data = request.get_json(silent=True)
+        if not data or "content" not in data:
+            api.abort(400, "'content' is required in request body")
         try:
-            data = request.json
-
             new_test = Test(content=data["content"])
             # データベースに追加
             db.session.add(new_test)
             db.session.commit()
 
             return new_test
-        except Exception as e:
-            return {"error": str(e)}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            api.abort(500, str(e))
 
 
 # localhost:5000/tests/<test_id> エンドポイント
@@ -87,6 +96,7 @@ class TestId(Resource):
     """
 
     @api.doc("get_test_id", params={"test_id": "取得対象のtest_id"})
+    @api.response(404, "Test data not found")
     @api.marshal_with(test_item_model)
     def get(self, test_id):
         """指定されたtest_idに対応する情報をデータベースから取得
@@ -99,16 +109,18 @@ class TestId(Resource):
         """
         try:
             # データベースからtest_idに対応するデータを取得
-            test_data = db.session.query(Test).filter_by(id=test_id).first()
-            if not test_data:
-                return {"error": "Test data not found"}, 404
+            test_data = db.session.get(Test, test_id)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            api.abort(500, str(e))
+        if not test_data:
+            api.abort(404, "Test data not found")
 
-            return test_data
-        except Exception as e:
-            return {"error": str(e)}
+        return test_data
 
     @api.doc("put_test_id")
     @api.expect(test_insert_and_update_model)
+    @api.response(404, "Test data not found")
     @api.marshal_with(test_item_model)
     def put(self, test_id):
         """指定されたtest_idに対応する情報を更新
@@ -119,22 +131,26 @@ class TestId(Resource):
         Returns:
             dict: test_idに対応する更新後のデータ
         """
-        body = request.json
+        body = request.get_json(silent=True)
+        if not body or "content" not in body:
+            api.abort(400, "'content' is required in request body")
         try:
             # データベースからtest_idに対応するデータを取得
-            test_data = db.session.query(Test).filter_by(id=test_id).first()
+            test_data = db.session.get(Test, test_id)
             if not test_data:
-                return {"error": "Test data not found"}, 404
+                api.abort(404, "Test data not found")
 
             # contentを更新
             test_data.content = body["content"]
             db.session.commit()
 
             return test_data
-        except Exception as e:
-            return {"error": str(e)}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            api.abort(500, str(e))
 
     @api.doc("delete_test_id")
+    @api.response(404, "Test data not found")
     def delete(self, test_id):
         """指定されたtest_idに対応する情報を削除
 
@@ -145,15 +161,13 @@ class TestId(Resource):
             dict: 削除結果のメッセージ
         """
         try:
-            # データベースからtest_idに対応するデータを取得
-            test_data = db.session.query(Test).filter_by(id=test_id).first()
-            if not test_data:
-                return {"error": "Test data not found"}, 404
-
-            # データを削除
-            db.session.delete(test_data)
+            # 取得せずに1回のDELETEで削除し、削除件数で存在を判定する（関連テーブルを持たないため）
+            deleted = db.session.execute(db.delete(Test).where(Test.id == test_id)).rowcount
             db.session.commit()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            api.abort(500, str(e))
+        if not deleted:
+            api.abort(404, "Test data not found")
 
-            return {"message": f"Test data with id {test_id} has been deleted."}
-        except Exception as e:
-            return {"error": str(e)}
+        return {"message": f"Test data with id {test_id} has been deleted."}
@@ -1,13 +1,23 @@
+import logging
+
 from flask import Blueprint, request
-from flask_restx import Namespace, Resource, fields
+from flask_restx import Namespace, Resource, fields, reqparse
+from sqlalchemy.exc import SQLAlchemyError
 
 from src.database import db
 from src.models import Novel, User
-from src.novels import novel_item_model
+from src.novels import novel_item_model, select_novel_list_items
+
+# ロガーの設定
+logger = logging.getLogger(__name__)
 
 users_module = Blueprint("users_module", __name__)
 api = Namespace("users", description="ユーザー関連の処理")
 
+# ユーザー一覧の1回の取得件数（デフォルトと上限）
+USER_LIST_DEFAULT_LIMIT = 100
+USER_LIST_MAX_LIMIT = 1000
+
 
 # -- models --
 user_registration_model = api.model(
@@ -38,6 +48,14 @@ user_item_model = api.model(
         "updated_at": fields.DateTime(description="更新日時"),
     },
 )
+# -- parser --
+users_list_parser = reqparse.RequestParser()
+users_list_parser.add_argument(
+    "limit", location="args", type=int, default=USER_LIST_DEFAULT_LIMIT, help=f"取得件数（最大{USER_LIST_MAX_LIMIT}件）"
+)
+users_list_parser.add_argument(
+    "after", location="args", type=str, help="前のページの最後のuser_id（このIDより後を取得）"
+)
 
 
 @api.route("/")
@@ -54,29 +72,53 @@ class UserList(Resource):
             new_user = User()
             db.session.add(new_user)
             db.session.commit()
-            print("new user registered")
-            return new_user
-        except Exception as e:
-            return {"error": str(e)}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Failed to register user: {e}")
+            api.abort(500, str(e))
+        logger.info(f"New user registered - id: {new_user.id}")
+        return new_user
 
     @api.doc("get_users")
-    @api.marshal_list_with(user_item_model)
+    @api.expect(users_list_parser)
+    @api.response(200, "ユーザーの一覧", [user_item_model])
     def get(self):
-        """全てのユーザー情報を取得する
+        """ユーザー情報をユーザID順に取得する
+
+        1回に返すのは最大 limit 件です。続きはレスポンスの最後のuser_idを after に指定して取得します。
+        user_item_modelで返す列のみをSELECTし、ORMのインスタンス化やmarshalを経由せずに辞書を組み立てます。
 
         Returns:
             List[Dict]: ユーザ情報（ユーザID、ユーザ名、メールアドレス、作成日時、更新日時）の配列
         """
+        args = users_list_parser.parse_args()
+        limit = min(max(args["limit"], 1), USER_LIST_MAX_LIMIT)
+        query = db.select(User.id, User.user_name, User.email, User.created_at, User.updated_at)
+        if args["after"]:
+            # OFFSETを使わず、主キーの範囲で続きを取得する
+            query = query.where(User.id > args["after"])
         try:
-            users = db.session.query(User).all()
-            return users
-        except Exception as e:
-            return {"error": str(e)}
+            rows = db.session.execute(query.order_by(User.id).limit(limit)).all()
+            return [
+                {
+                    "user_id": row.id,
+                    "user_name": row.user_name,
+                    "email": row.email,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at,
+                }
+                for row in rows
+            ]
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Failed to get users: {e}")
+            api.abort(500, str(e))
 
 
 @api.route("/<string:user_id>")
 class UserItem(Resource):
     @api.doc("get_user_id", params={"user_id": "取得対象のuser_id"})
+    @api.response(404, "User not found")
     @api.marshal_with(user_item_model)
     def get(self, user_id):
         """idからユーザー情報を返す
@@ -88,13 +130,19 @@ class UserItem(Resource):
             Dict: ユーザー情報
         """
         try:
-            user = User.query.get(user_id)
-            return user
-        except Exception as e:
-            return {"error": str(e)}
+            user = db.session.get(User, user_id)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Failed to get user - id: {user_id}: {e}")
+            api.abort(500, str(e))
+        if not user:
+            api.abort(404, f"user not found - searched id:{user_id}")
+        return user
 
     @api.doc("post_user_id", params={"user_id": "対象のuser_id"})
     @api.expect(user_setting_model)
+    @api.response(400, "user_name と email がどちらも空")
+    @api.response(404, "User not found")
     @api.marshal_with(user_item_model)
     def put(self, user_id):
         """ユーザ情報の更新
@@ -104,37 +152,47 @@ class UserItem(Resource):
         Returns:
             dict: 更新後のユーザ情報（ユーザID、ユーザ名、メールアドレス、作成日時、更新日時）
         """
-        request_body = request.get_json()
-        try:
-            print(f"try to change user data - id: {user_id}")
+        request_body = request.get_json(cache=False, silent=True) or {}
 
-            # データベースからuser_idに対応するデータを取得
-            user_data = db.session.query(User).filter_by(id=user_id).first()
-            if not user_data:
-                print("user not found")
-                return {"error": f"user not found - searched id:{user_id}"}, 404
+        # リクエストボディから値を取得
+        user_name = request_body.get("user_name")
+        email = request_body.get("email")
 
-            # リクエストボディから値を取得
-            user_name = request_body.get("user_name")
-            email = request_body.get("email")
+        # 少なくとも一つの値が空でないかチェック
+        if not user_name and not email:
+            api.abort(400, "user_name または email の少なくとも一つは空でない値を指定してください")
 
-            # 少なくとも一つの値が空でないかチェック
-            if not user_name and not email:
-                return {"error": "user_name または email の少なくとも一つは空でない値を指定してください"}, 400
+        # 空でない値のみを更新する
+        updates = {}
+        if user_name:
+            updates["user_name"] = user_name
+        if email:
+            updates["email"] = email
 
-            # 空でない値でデータベースを更新
-            if user_name:
-                user_data.user_name = user_name
-            if email:
-                user_data.email = email
+        try:
+            logger.debug(f"Updating user - id: {user_id}")
+
+            # 取得せずに1回のUPDATEで更新し、更新後の行をRETURNINGで受け取る（updated_atはonupdateで設定される）
+            user_data = db.session.execute(
+                db.update(User)
+                .where(User.id == user_id)
+                .values(**updates)
+                .returning(User.id, User.user_name, User.email, User.created_at, User.updated_at)
+            ).first()
+            if not user_data:
+                logger.warning(f"User not found - id: {user_id}")
+                api.abort(404, f"user not found - searched id:{user_id}")
 
             db.session.commit()
 
             return user_data
-        except Exception as e:
-            return {"error": str(e)}
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Failed to update user - id: {user_id}: {e}")
+            api.abort(500, str(e))
 
     @api.doc("delete_user_id", params={"user_id": "対象のuser_id"})
+    @api.response(404, "User not found")
     def delete(self, user_id):
         """指定されたuser_idに対応するユーザ情報を削除
 
@@ -144,27 +202,29 @@ class UserItem(Resource):
             dict: 削除結果のメッセージ
         """
         try:
-            print(f"try to delete user data - id: {user_id}")
+            logger.debug(f"Deleting user - id: {user_id}")
             # データベースからuser_idに対応するデータを取得
-            user_data = User.query.get(user_id)
+            user_data = db.session.get(User, user_id)
             if not user_data:
-                print("user not found")
-                return {"error": f"user not found - searched id:{user_id}"}, 404
+                logger.warning(f"User not found - id: {user_id}")
+                api.abort(404, f"user not found - searched id:{user_id}")
 
             # データベースからデータを削除
             db.session.delete(user_data)
             db.session.commit()
-            print(f"deleted user - id:{user_id}")
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Failed to delete user - id: {user_id}: {e}")
+            api.abort(500, str(e))
+        logger.info(f"User deleted - id: {user_id}")
 
-            return {"message": f"User with id {user_id} has been deleted."}
-        except Exception as e:
-            return {"error": str(e)}
+        return {"message": f"User with id {user_id} has been deleted."}
 
 
 @api.route("/<string:user_id>/novels")
 class UserNovelList(Resource):
     @api.doc("get_user_id/novels", params={"user_id": "対象のuser_id"})
-    @api.marshal_list_with(novel_item_model)
+    @api.response(200, "ユーザの小説のリスト", [novel_item_model])
     def get(self, user_id):
         """指定されたuser_idに対応するユーザの小説一覧を返す
 
@@ -176,8 +236,8 @@ class UserNovelList(Resource):
         """
         try:
             # データベースからuser_idに対応するデータを取得
-            novels = db.session.query(Novel).filter_by(user_id=user_id).all()
-            return novels
-        except Exception as e:
-            print(f"Er - UserNovelList - {str(e)}")
-            return {"error": str(e)}
+            return select_novel_list_items(Novel.user_id == user_id)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            logger.error(f"Error in UserNovelList - user_id: {user_id}: {str(e)}")
+            api.abort(500, str(e))